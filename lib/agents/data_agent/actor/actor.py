@@ -3,6 +3,7 @@
 Translates plan steps into concrete tool calls and executes them with self-repair.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass
 import traceback
@@ -51,6 +52,8 @@ class Actor:
         self.tool_registry = tool_registry
         self.schema_context = schema_context or {}
         self.execution_history: List[Observation] = []
+        # Latest observation per step, kept in step with execution_history
+        self._latest_observations: Dict[str, Observation] = {}
     
     def ground_step(
         self,
@@ -109,7 +112,7 @@ class Actor:
     ) -> Observation:
         """Execute tool call with self-repair loop.
         
-        Implements retry logic with exponential backoff for recoverable failures.
+        Retries recoverable failures immediately, without a backoff delay.
         
         Args:
             tool_call: Grounded tool invocation
@@ -125,6 +128,16 @@ class Actor:
             >>> obs.is_success()
             True
         """
+        observation = self._run_with_repair(tool_call, max_retries)
+        self._record(observation)
+        return observation
+    
+    def _run_with_repair(
+        self,
+        tool_call: ToolCall,
+        max_retries: Optional[int] = None,
+    ) -> Observation:
+        """Run the self-repair loop without recording the final observation."""
         max_retries = max_retries if max_retries is not None else self.MAX_RETRIES
         last_error = None
         
@@ -140,8 +153,6 @@ class Actor:
                     retry_count=attempt,
                     metadata=self._extract_metadata(result),
                 )
-                
-                self.execution_history.append(observation)
                 return observation
                 
             except Exception as e:
@@ -171,7 +182,6 @@ class Actor:
                         error_message=final_error_message,
                         retry_count=attempt,
                     )
-                    self.execution_history.append(final_observation)
                     return final_observation
     
     def execute_step(
@@ -202,6 +212,105 @@ class Actor:
                 retry_count=0,
             )
     
+    def execute_plan(
+        self,
+        steps: List[PlanStep],
+        execution_context: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+    ) -> List[Observation]:
+        """Execute plan steps in dependency order, running independent steps in parallel.
+        
+        Steps run in waves: every step whose dependencies have finished is
+        grounded against its own copy of the context and its tool call is
+        submitted to a thread pool together with the rest of the wave. A step
+        whose dependency failed is not run and gets a FAILURE observation
+        instead. Dependencies on step IDs outside ``steps`` are treated as
+        already satisfied.
+        
+        Once a wave finishes, observations are recorded in step order on the
+        calling thread and each successful result is merged into
+        ``execution_context`` as ``step_<step_id>_result``, so later waves see
+        it. Tools from the registry may still be called concurrently and must
+        be safe to share between threads.
+        
+        Args:
+            steps: Plan steps to execute
+            execution_context: Runtime context; updated with step results
+            max_workers: Maximum steps executed concurrently
+        
+        Returns:
+            Observation for each step, in the order of steps
+        
+        Raises:
+            ValueError: If the step dependencies contain a cycle
+        """
+        execution_context = execution_context if execution_context is not None else {}
+        steps_by_id = {step.step_id: step for step in steps}
+        pending = {
+            step.step_id: {dep for dep in step.dependencies if dep in steps_by_id}
+            for step in steps
+        }
+        observations: Dict[str, Observation] = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                ready = [step_id for step_id, deps in pending.items() if not deps]
+                if not ready:
+                    raise ValueError(f"Dependency cycle among steps: {sorted(pending)}")
+                
+                futures = {}
+                for step_id in ready:
+                    del pending[step_id]
+                    step = steps_by_id[step_id]
+                    failed_deps = [
+                        dep for dep in step.dependencies
+                        if dep in observations and not observations[dep].is_success()
+                    ]
+                    
+                    if failed_deps:
+                        observations[step_id] = Observation(
+                            step_id=step_id,
+                            status=ExecutionStatus.FAILURE,
+                            result=None,
+                            error_message=f"Skipped: dependency failed: {', '.join(failed_deps)}",
+                            retry_count=0,
+                        )
+                        continue
+                    
+                    try:
+                        tool_call = self.ground_step(step, dict(execution_context))
+                    except Exception as e:
+                        observations[step_id] = Observation(
+                            step_id=step_id,
+                            status=ExecutionStatus.FAILURE,
+                            result=None,
+                            error_message=f"Grounding failed: {type(e).__name__}: {str(e)}",
+                            retry_count=0,
+                        )
+                        continue
+                    
+                    future = executor.submit(self._run_with_repair, tool_call)
+                    futures[future] = step_id
+                
+                for future in as_completed(futures):
+                    observations[futures[future]] = future.result()
+                
+                # Record and merge on this thread, in step order, so history
+                # and context are deterministic regardless of completion order
+                submitted = set(futures.values())
+                for step in steps:
+                    if step.step_id not in submitted:
+                        continue
+                    observation = observations[step.step_id]
+                    self._record(observation)
+                    if observation.is_success():
+                        execution_context[f"step_{step.step_id}_result"] = observation.result
+                
+                for deps in pending.values():
+                    deps.difference_update(ready)
+        
+        return [observations[step.step_id] for step in steps]
+    
     def _execute_tool(self, tool_call: ToolCall) -> Any:
         """Execute tool with concrete arguments.
         
@@ -350,24 +459,30 @@ class Actor:
         Raises:
             ValueError: If invariant validation fails
         """
+        # Only aggregations can violate an invariant today
+        if arguments.get("operation_type") != "aggregate":
+            return
+        
         for invariant in step.invariants:
             if "filter_before_aggregate" in invariant:
-                if arguments.get("operation_type") == "aggregate":
-                    if not self._has_prior_filter(step):
-                        raise ValueError(
-                            f"Invariant violation: {invariant} not satisfied"
-                        )
+                if not self._has_prior_filter(step):
+                    raise ValueError(
+                        f"Invariant violation: {invariant} not satisfied"
+                    )
     
     def _has_prior_filter(self, step: PlanStep) -> bool:
         """Check if step has a filter operation in its dependency chain."""
-        history_map = {obs.step_id: obs for obs in self.execution_history}
         for dep_id in step.dependencies:
-            if dep_id in history_map:
-                dep_obs = history_map[dep_id]
-                if dep_obs.metadata.get("operation_type") == "filter":
-                    return True
+            dep_obs = self._latest_observations.get(dep_id)
+            if dep_obs is not None and dep_obs.metadata.get("operation_type") == "filter":
+                return True
         return False
     
+    def _record(self, observation: Observation) -> None:
+        """Append observation to history and index it by step."""
+        self.execution_history.append(observation)
+        self._latest_observations[observation.step_id] = observation
+    
     def _extract_metadata(self, result: Any) -> Dict[str, Any]:
         """Extract metadata from tool execution result."""
         metadata = {}
@@ -88,20 +88,47 @@ class DataAgent:
         'clientsecret', 'clientid', 'sessionid', 'sessiontoken'
     }
     
+    _KEY_SEPARATOR_PATTERN = re.compile(r'[^a-z0-9]')
+    
+    # Patterns for detecting credentials in string values
+    _CREDENTIAL_PATTERNS = [
+        # Bearer tokens
+        re.compile(r'(?i)\b(bearer)\s+[A-Za-z0-9\-\._~\+\/]+=*'),
+        # Key-value assignments with various formats
+        re.compile(
+            r'(?i)\b(password|passwd|pwd|token|access[_\-]?token|refresh[_\-]?token|'
+            r'api[_\-]?key|secret|private[_\-]?key|connection[_\-]?string|'
+            r'client[_\-]?secret|session[_\-]?id|session[_\-]?token)\b\s*[:=]\s*'
+            r'("[^"]+"|\'[^\']+\'|[^\s,;]+)'
+        ),
+        # High-entropy strings that look like tokens (32+ chars)
+        re.compile(r'\b[A-Za-z0-9+/]{32,}={0,2}\b'),
+        # AWS-style keys
+        re.compile(r'(?i)\b(AKIA|A3T|AGPA|AIDA|AROA|AIPA|ANPA|ANVA|ASIA)[A-Z0-9]{16}\b'),
+    ]
+    
     def __init__(
         self,
         tool_registry: Dict[str, Callable],
         anthropic_api_key: Optional[str] = None,
         recipe_store_path: str = "db/recipe_memory.db",
         audit_log_path: str = "logs/data_agent_runs.jsonl",
+        audit_buffered: bool = False,
+        recipe_embedder: Optional[Any] = None,
     ):
         """Initialize DataAgent.
         
         Args:
             tool_registry: Map of tool names to callable functions
             anthropic_api_key: API key for LLM calls (Planner)
-            recipe_store_path: Path to recipe storage database
+            recipe_store_path: Path to recipe storage database, or ":memory:"
+                for a private in-memory store
             audit_log_path: Path to audit log file
+            audit_buffered: Buffer audit writes and write each request's events
+                out together when analyze() returns, instead of writing each
+                event immediately
+            recipe_embedder: Already-loaded embedding model to share with the
+                recipe store instead of loading one lazily
         """
         self.tool_registry = tool_registry
         
@@ -109,20 +136,30 @@ class DataAgent:
         self.intent_parser = IntentParser(api_key=anthropic_api_key) if anthropic_api_key else None
         self.plan_builder = PlanBuilder()
         self.actor = Actor(tool_registry=tool_registry)
-        self.recipe_store = RecipeStore(db_path=recipe_store_path)
+        self.recipe_store = RecipeStore(db_path=recipe_store_path, embedder=recipe_embedder)
         self.schema_fingerprinter = SchemaFingerprinter()
-        self.audit_tracer = AuditTracer(log_path=audit_log_path)
+        self.audit_tracer = AuditTracer(log_path=audit_log_path, buffered=audit_buffered)
         
         # Progress callback
         self._progress_callback: Optional[Callable[[str, float], None]] = None
+        self._progress_granularity = 0.0
+        self._last_reported_progress = 0.0
     
-    def set_progress_callback(self, callback: Callable[[str, float], None]) -> None:
+    def set_progress_callback(
+        self,
+        callback: Optional[Callable[[str, float], None]],
+        granularity: float = 0.0,
+    ) -> None:
         """Set callback for progress updates.
         
         Args:
-            callback: Function(message: str, progress: float) called during analysis
+            callback: Function(message: str, progress: float) called during analysis,
+                or None to stop reporting
+            granularity: Minimum progress increase between intermediate updates;
+                the 0.0 and 1.0 updates are always delivered. 0.0 reports every update.
         """
         self._progress_callback = callback
+        self._progress_granularity = granularity
     
     def _redact_sensitive_data(self, obj: Any) -> Any:
         """Recursively redact sensitive data from objects before logging.
@@ -135,7 +172,7 @@ class DataAgent:
         """
         def _normalize_key(key: Any) -> str:
             """Normalize key for comparison by removing non-alphanumeric chars and lowercasing."""
-            return re.sub(r'[^a-z0-9]', '', str(key).lower())
+            return self._KEY_SEPARATOR_PATTERN.sub('', str(key).lower())
         
         if isinstance(obj, dict):
             redacted = {}
@@ -155,23 +192,8 @@ class DataAgent:
         elif isinstance(obj, list):
             return [self._redact_sensitive_data(item) for item in obj]
         elif isinstance(obj, str):
-            # Improved patterns for detecting credentials in string values
-            credential_patterns = [
-                # Bearer tokens
-                r'(?i)\b(bearer)\s+[A-Za-z0-9\-\._~\+\/]+=*',
-                # Key-value assignments with various formats
-                r'(?i)\b(password|passwd|pwd|token|access[_\-]?token|refresh[_\-]?token|'
-                r'api[_\-]?key|secret|private[_\-]?key|connection[_\-]?string|'
-                r'client[_\-]?secret|session[_\-]?id|session[_\-]?token)\b\s*[:=]\s*'
-                r'("[^"]+"|\'[^\']+\'|[^\s,;]+)',
-                # High-entropy strings that look like tokens (32+ chars)
-                r'\b[A-Za-z0-9+/]{32,}={0,2}\b',
-                # AWS-style keys
-                r'(?i)\b(AKIA|A3T|AGPA|AIDA|AROA|AIPA|ANPA|ANVA|ASIA)[A-Z0-9]{16}\b',
-            ]
-            
-            for pattern in credential_patterns:
-                if re.search(pattern, obj):
+            for pattern in self._CREDENTIAL_PATTERNS:
+                if pattern.search(obj):
                     return "***REDACTED***"
             return obj
         else:
@@ -429,6 +451,10 @@ class DataAgent:
                 audit_log_ref=f"logs:{request.request_id}",
                 error_message=str(e),
             )
+        
+        finally:
+            # Buffered audit logs are written out once per request
+            self.audit_tracer.flush()
     
     def _get_schema_fingerprint(self, data_source: str) -> Optional[str]:
         """Get schema fingerprint for data source.
@@ -541,8 +567,20 @@ class DataAgent:
             message: Progress message
             progress: Progress value (0.0-1.0)
         """
-        if self._progress_callback:
-            self._progress_callback(message, progress)
+        if not self._progress_callback:
+            return
+        
+        is_endpoint = progress <= 0.0 or progress >= 1.0
+        if not is_endpoint and progress - self._last_reported_progress < self._progress_granularity:
+            return
+        
+        self._last_reported_progress = progress
+        self._progress_callback(message, progress)
+    
+    def close(self) -> None:
+        """Flush buffered audit entries and release the audit log and recipe store."""
+        self.audit_tracer.close()
+        self.recipe_store.close()
     
     def verify_audit_integrity(self) -> tuple[bool, Optional[str]]:
         """Verify audit log integrity.
@@ -6,10 +6,11 @@ Enables cryptographic verification of log integrity.
 
 import hashlib
 import json
+import os
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 
 
 @dataclass
@@ -58,15 +59,27 @@ class MerkleLog:
     """
     
     GENESIS_HASH = "0" * 64
+    BUFFER_SIZE = 65536
     
-    def __init__(self, log_path: str = "logs/data_agent_runs.jsonl"):
+    def __init__(
+        self,
+        log_path: Union[str, os.PathLike] = "logs/data_agent_runs.jsonl",
+        buffered: bool = False,
+    ):
         """Initialize Merkle log.
         
         Args:
             log_path: Path to JSONL log file
+            buffered: Keep the file open and coalesce appends in a write
+                buffer instead of opening and writing the file per entry.
+                Buffered entries reach disk on flush(), close(), or before
+                any read of the log.
         """
         self.log_path = Path(log_path)
-        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.log_path.parent.exists():
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffered = buffered
+        self._writer: Optional[BinaryIO] = None
         self._last_hash: Optional[str] = None
         self._load_last_hash()
     
@@ -93,8 +106,9 @@ class MerkleLog:
                 buffer_size = min(4096, file_size)
                 f.seek(max(0, file_size - buffer_size))
                 
-                # Read buffer and find last newline
-                buffer = f.read(buffer_size).decode('utf-8')
+                # Read buffer and find last newline. The window may start
+                # mid-character; only the last line is used, so drop partials.
+                buffer = f.read(buffer_size).decode('utf-8', errors='ignore')
                 lines = buffer.splitlines()
                 
                 # Get last non-empty line
@@ -140,13 +154,40 @@ class MerkleLog:
         )
         
         entry.entry_hash = entry.compute_hash()
+        line = self._encode_line(asdict(entry))
         
-        with open(self.log_path, 'a') as f:
-            f.write(json.dumps(asdict(entry)) + '\n')
+        if self.buffered:
+            if self._writer is None:
+                self._writer = open(self.log_path, 'ab', buffering=self.BUFFER_SIZE)
+            self._writer.write(line)
+        else:
+            with open(self.log_path, 'ab') as f:
+                f.write(line)
         
         self._last_hash = entry.entry_hash
         return entry
     
+    @staticmethod
+    def _encode_line(entry_dict: Dict[str, Any]) -> bytes:
+        """Serialize an entry as one ASCII JSONL line.
+        
+        Uses the same stdlib encoder as compute_hash() so every value that
+        can be hashed (NaN, arbitrarily large ints, non-ASCII text) round-trips
+        unchanged and the stored entry re-hashes to its entry_hash.
+        """
+        return (json.dumps(entry_dict) + '\n').encode('ascii')
+    
+    def flush(self) -> None:
+        """Write any buffered entries to the log file."""
+        if self._writer is not None:
+            self._writer.flush()
+    
+    def close(self) -> None:
+        """Flush buffered entries and release the log file handle."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
     def verify_chain(self) -> tuple[bool, Optional[str]]:
         """Verify integrity of entire Merkle chain.
         
@@ -155,6 +196,7 @@ class MerkleLog:
             - (True, None) if chain is valid
             - (False, error_message) if tampered or corrupted
         """
+        self.flush()
         if not self.log_path.exists():
             return (True, None)
         
@@ -209,13 +251,23 @@ class MerkleLog:
         Returns:
             List of matching LogEntry objects
         """
+        self.flush()
         if not self.log_path.exists():
             return []
         
+        # An entry can only match the prefix if its line contains the prefix
+        # verbatim, so other lines are skipped without being decoded. Only
+        # done for prefixes that the JSON encoder writes unescaped.
+        needle = None
+        if entry_id_prefix and entry_id_prefix.isascii() and json.dumps(entry_id_prefix)[1:-1] == entry_id_prefix:
+            needle = entry_id_prefix
+        
         entries: List[LogEntry] = []
         
         with open(self.log_path, 'r') as f:
             for line in f:
+                if needle is not None and needle not in line:
+                    continue
                 entry_dict = json.loads(line.strip())
                 entry = LogEntry(**entry_dict)
                 
@@ -238,6 +290,7 @@ class MerkleLog:
         Returns:
             Dictionary with entry counts by event type, total entries, etc.
         """
+        self.flush()
         if not self.log_path.exists():
             return {
                 "total_entries": 0,
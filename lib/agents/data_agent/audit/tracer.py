@@ -3,8 +3,9 @@
 Logs all significant events in the DataAgent workflow to Merkle-chained log.
 """
 
+import os
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 import uuid
 
 from lib.agents.data_agent.audit.merkle_log import MerkleLog
@@ -30,13 +31,18 @@ class AuditTracer:
     Wraps MerkleLog with event-specific methods for common logging patterns.
     """
     
-    def __init__(self, log_path: str = "logs/data_agent_runs.jsonl"):
+    def __init__(
+        self,
+        log_path: Union[str, os.PathLike] = "logs/data_agent_runs.jsonl",
+        buffered: bool = False,
+    ):
         """Initialize audit tracer.
         
         Args:
             log_path: Path to JSONL audit log
+            buffered: Buffer log writes until flush()/close() (see MerkleLog)
         """
-        self.log = MerkleLog(log_path)
+        self.log = MerkleLog(log_path, buffered=buffered)
     
     def log_request(self, request_id: str, intent: str, data_sources: list) -> None:
         """Log analysis request submission.
@@ -305,6 +311,14 @@ class AuditTracer:
             },
         )
     
+    def flush(self) -> None:
+        """Write buffered audit entries to disk."""
+        self.log.flush()
+    
+    def close(self) -> None:
+        """Flush buffered audit entries and close the log file."""
+        self.log.close()
+    
     def verify_integrity(self) -> tuple[bool, Optional[str]]:
         """Verify Merkle chain integrity.
         
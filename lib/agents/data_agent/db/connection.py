@@ -3,15 +3,40 @@
 Provides connection pooling and migration management for SQLite and PostgreSQL.
 """
 
+import os
 import sqlite3
+import time
+import uuid
 from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Dict, Generator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _split_sql_statements(script: str) -> List[str]:
+    """Split a SQL script into single statements for Connection.execute().
+    
+    Splits on ';' but uses sqlite3.complete_statement to keep semicolons
+    inside string literals, comments and trigger bodies with their statement.
+    """
+    statements = []
+    buffer = ""
+    *pieces, tail = script.split(";")
+    for piece in pieces:
+        buffer += piece + ";"
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer)
+            buffer = ""
+    
+    buffer += tail
+    if buffer.strip():
+        statements.append(buffer)
+    return statements
+
+
 class DatabaseConnection:
     """Database connection manager with migration support.
     
@@ -22,6 +47,11 @@ class DatabaseConnection:
     - Thread-safe operations
     """
     
+    # A directory listing is only reused if the directory's mtime was at least
+    # this old when it was listed; filesystem timestamps are coarse, so a file
+    # added right after a fresh listing could otherwise leave the mtime unchanged.
+    MIGRATION_LISTING_MIN_AGE_NS = 2_000_000_000
+    
     def __init__(
         self,
         db_path: str = "db/recipe_memory.db",
@@ -31,15 +61,23 @@ class DatabaseConnection:
         """Initialize database connection manager.
         
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, or ":memory:" for a private
+                in-memory database shared by every get_connection() call
             db_type: Database type ('sqlite' or 'postgres')
             connection_string: Optional Postgres connection string
         """
         self.db_type = db_type
-        self.db_path = Path(db_path)
         self.connection_string = connection_string
+        self._in_memory = db_type == "sqlite" and str(db_path) == ":memory:"
+        self._keepalive_conn: Optional[sqlite3.Connection] = None
+        self._migrations_cache: Dict[str, Tuple[int, List[str]]] = {}
         
-        if self.db_type == "sqlite":
+        if self._in_memory:
+            self._open_memory_database()
+        else:
+            self.db_path = Path(db_path)
+        
+        if self.db_type == "sqlite" and not self._in_memory:
             try:
                 self.db_path.parent.mkdir(parents=True, exist_ok=True)
             except (OSError, PermissionError) as e:
@@ -47,6 +85,16 @@ class DatabaseConnection:
         elif self.db_type == "postgres" and not connection_string:
             raise ValueError("Postgres requires connection_string")
     
+    def _open_memory_database(self) -> None:
+        """Create a fresh named shared-cache in-memory SQLite database.
+        
+        get_connection() opens a new connection per call, so a plain ":memory:"
+        would give each one an empty database. The keepalive connection holds
+        the shared one open for the lifetime of this manager.
+        """
+        self.db_path = f"file:db_connection_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._keepalive_conn = sqlite3.connect(self.db_path, uri=True)
+    
     @contextmanager
     def get_connection(self) -> Generator:
         """Get database connection with automatic cleanup.
@@ -61,7 +109,7 @@ class DatabaseConnection:
             ...     cursor.execute("SELECT * FROM recipes")
         """
         if self.db_type == "sqlite":
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, uri=self._in_memory)
             try:
                 yield conn
                 conn.commit()
@@ -90,7 +138,7 @@ class DatabaseConnection:
         else:
             raise ValueError(f"Unsupported database type: {self.db_type}")
     
-    def run_migrations(self, migrations_dir: str = "db/migrations") -> None:
+    def run_migrations(self, migrations_dir: str = "db/migrations") -> List[str]:
         """Run all pending migrations in order.
         
         Migrations are SQL files named NNN_description.sql (e.g., 001_create_recipes.sql).
@@ -99,16 +147,21 @@ class DatabaseConnection:
         Args:
             migrations_dir: Directory containing migration SQL files
         
+        Returns:
+            IDs of the migrations applied by this call, in apply order
+            (empty when everything was already applied)
+        
         Example:
             >>> db = DatabaseConnection()
             >>> db.run_migrations()
             Applied migration: 001_create_recipes.sql
+            ['001_create_recipes.sql']
         """
         migrations_path = Path(migrations_dir)
         
         if not migrations_path.exists():
             logger.warning(f"Migrations directory not found: {migrations_dir}")
-            return
+            return []
         
         # Create migrations tracking table
         with self.get_connection() as conn:
@@ -124,36 +177,60 @@ class DatabaseConnection:
             cursor.execute("SELECT migration_id FROM schema_migrations")
             applied = {row[0] for row in cursor.fetchall()}
             
-            # Find and apply pending migrations
-            migration_files = sorted(migrations_path.glob("*.sql"))
+            pending = [
+                migration_id
+                for migration_id in self._list_migrations(migrations_path)
+                if migration_id not in applied
+            ]
+            if not pending:
+                logger.debug("No pending migrations")
+                return []
             
-            for migration_file in migration_files:
-                migration_id = migration_file.name
-                
-                if migration_id in applied:
-                    logger.debug(f"Skipping applied migration: {migration_id}")
-                    continue
-                
+            # Apply every pending migration in one transaction: executescript()
+            # would commit after each file, so statements are run one by one
+            conn.execute("BEGIN IMMEDIATE")
+            for migration_id in pending:
                 logger.info(f"Applying migration: {migration_id}")
-                
-                # Read and execute migration SQL
-                migration_sql = migration_file.read_text()
-                
-                # Execute migration SQL
-                # Note: executescript() auto-commits, breaking transaction handling
-                # Use cursor.execute() for each statement instead
-                cursor = conn.cursor()
-                cursor.executescript(migration_sql)
-                
-                # Record migration as applied
-                from datetime import datetime, timezone
-                applied_at = datetime.now(timezone.utc).isoformat()
-                conn.execute(
-                    "INSERT INTO schema_migrations (migration_id, applied_at) VALUES (?, ?)",
-                    (migration_id, applied_at),
-                )
-                
+                migration_sql = (migrations_path / migration_id).read_text()
+                for statement in _split_sql_statements(migration_sql):
+                    conn.execute(statement)
+            
+            # Record migrations as applied
+            applied_at = datetime.now(timezone.utc).isoformat()
+            conn.executemany(
+                "INSERT INTO schema_migrations (migration_id, applied_at) VALUES (?, ?)",
+                [(migration_id, applied_at) for migration_id in pending],
+            )
+            
+            for migration_id in pending:
                 logger.info(f"Applied migration: {migration_id}")
+        
+        return pending
+    
+    def _list_migrations(self, migrations_path: Path) -> List[str]:
+        """Return sorted migration file names, reusing the last listing if unchanged.
+        
+        Args:
+            migrations_path: Directory containing migration SQL files
+        
+        Returns:
+            Names of the *.sql files in migrations_path, in apply order
+        """
+        key = str(migrations_path)
+        mtime_ns = migrations_path.stat().st_mtime_ns
+        cached = self._migrations_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        with os.scandir(migrations_path) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name.endswith(".sql") and entry.is_file()
+            )
+        
+        if time.time_ns() - mtime_ns >= self.MIGRATION_LISTING_MIN_AGE_NS:
+            self._migrations_cache[key] = (mtime_ns, names)
+        return names
     
     def check_connection(self) -> bool:
         """Verify database connection is working.
@@ -175,7 +252,11 @@ class DatabaseConnection:
         
         Only use for testing/development. Requires explicit confirmation.
         """
-        if self.db_type == "sqlite":
+        if self._in_memory:
+            self._keepalive_conn.close()
+            self._open_memory_database()
+            logger.warning("Replaced in-memory SQLite database")
+        elif self.db_type == "sqlite":
             if self.db_path.exists():
                 self.db_path.unlink()
                 logger.warning(f"Deleted SQLite database: {self.db_path}")
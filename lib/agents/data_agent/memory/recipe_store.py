@@ -9,11 +9,13 @@ import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 import uuid
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 
 @dataclass
@@ -52,35 +54,108 @@ class RecipeStore:
     - Success tracking and recency scoring
     """
     
+    INTENT_CACHE_SIZE = 256
+    
     def __init__(
         self,
         db_path: str = "db/recipe_memory.db",
         embedding_model: str = "all-MiniLM-L6-v2",
+        embedder: Optional["SentenceTransformer"] = None,
     ):
         """Initialize recipe store.
         
         Args:
-            db_path: Path to SQLite database
+            db_path: Path to SQLite database, or ":memory:" (or a
+                    "file::memory:" URI) for a private in-memory database
             embedding_model: Sentence-transformer model name
+            embedder: Already-loaded model (anything with an ``encode`` method)
+                     to share instead of loading ``embedding_model`` lazily
         """
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        db_path = str(db_path)
+        self._in_memory = db_path == ":memory:" or db_path.startswith("file::memory:")
+        
+        if db_path == ":memory:":
+            # Every method opens its own connection, so a plain ":memory:" would
+            # hand each one a fresh empty database; name a shared-cache one instead.
+            db_path = f"file:recipe_store_{uuid.uuid4().hex}?mode=memory&cache=shared"
+        
+        if self._in_memory:
+            self.db_path = db_path
+            # The shared in-memory database lives only while a connection is open
+            self._keepalive_conn = sqlite3.connect(self.db_path, uri=True)
+        else:
+            self.db_path = Path(db_path)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._keepalive_conn = None
         
         self._embedding_model_name = embedding_model
-        self._embedding_model = None
+        self._embedding_model = embedder
+        self._intent_embeddings: Dict[str, np.ndarray] = {}
         
         self._init_db()
     
     @property
     def embedding_model(self):
-        """Lazy-load the sentence transformer model."""
+        """Lazy-load the sentence transformer model.
+        
+        sentence_transformers (and torch behind it) is only imported here, so
+        importing the store or DataAgent stays cheap until an embedding is needed.
+        """
         if self._embedding_model is None:
+            from sentence_transformers import SentenceTransformer
             self._embedding_model = SentenceTransformer(self._embedding_model_name)
         return self._embedding_model
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection tuned for the store's backend.
+        
+        In-memory databases skip journaling and syncing entirely. On-disk
+        databases keep SQLite's default rollback journal and full syncing,
+        so no -wal/-shm sidecar files appear next to the user's database.
+        """
+        conn = sqlite3.connect(self.db_path, uri=self._in_memory)
+        if self._in_memory:
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    def close(self) -> None:
+        """Release the connection that keeps an in-memory database alive.
+        
+        An in-memory store's recipes are discarded once it is closed. On-disk
+        stores hold no connection between calls, so this is a no-op for them.
+        """
+        if self._keepalive_conn is not None:
+            self._keepalive_conn.close()
+            self._keepalive_conn = None
+    
+    def __del__(self):
+        # getattr: __init__ may have failed before the attribute was set
+        if getattr(self, "_keepalive_conn", None) is not None:
+            self._keepalive_conn.close()
+    
+    def _embed_intent(self, intent: str) -> np.ndarray:
+        """Embed a retrieval intent, memoized per store.
+        
+        The encoder is deterministic, so repeated queries with the same
+        intent skip the model forward pass. Cached vectors are read-only and
+        the oldest entry is evicted once INTENT_CACHE_SIZE is reached.
+        """
+        embedding = self._intent_embeddings.get(intent)
+        if embedding is None:
+            embedding = np.asarray(self.embedding_model.encode(intent), dtype=np.float32)
+            embedding.flags.writeable = False
+            
+            if len(self._intent_embeddings) >= self.INTENT_CACHE_SIZE:
+                self._intent_embeddings.pop(next(iter(self._intent_embeddings)))
+            self._intent_embeddings[intent] = embedding
+        
+        return embedding
+    
     def _init_db(self) -> None:
         """Initialize database schema if not exists."""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS recipes (
@@ -128,15 +203,41 @@ class RecipeStore:
         Returns:
             Recipe ID (UUID)
         """
-        recipe_id = str(uuid.uuid4())
+        return self.save_recipes_bulk([
+            {
+                "schema_fingerprint": schema_fingerprint,
+                "intent_template": intent_template,
+                "plan_structure": plan_structure,
+                "tool_argument_templates": tool_argument_templates,
+            }
+        ])[0]
+    
+    def save_recipes_bulk(self, entries: List[dict]) -> List[str]:
+        """Save several recipes with a single batched embedding call.
+        
+        Args:
+            entries: Dicts with the same keys as save_recipe's arguments
+                    (schema_fingerprint, intent_template, plan_structure,
+                    tool_argument_templates)
+        
+        Returns:
+            Recipe IDs (UUIDs) in the order of entries
+        """
+        if not entries:
+            return []
         
-        intent_embedding = self.embedding_model.encode(intent_template).astype(np.float32)
+        recipe_ids = [str(uuid.uuid4()) for _ in entries]
+        
+        intent_embeddings = np.asarray(
+            self.embedding_model.encode([entry["intent_template"] for entry in entries]),
+            dtype=np.float32,
+        )
         
         now_iso = datetime.now(timezone.utc).isoformat()
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO recipes (
                     recipe_id, schema_fingerprint, intent_template, 
@@ -144,23 +245,28 @@ class RecipeStore:
                     success_count, created_at, last_used_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    recipe_id,
-                    schema_fingerprint,
-                    intent_template,
-                    intent_embedding.tobytes(),
-                    json.dumps(plan_structure),
-                    json.dumps(tool_argument_templates),
-                    1,
-                    now_iso,
-                    now_iso,
-                ),
+                [
+                    (
+                        recipe_id,
+                        entry["schema_fingerprint"],
+                        entry["intent_template"],
+                        intent_embedding.tobytes(),
+                        json.dumps(entry["plan_structure"]),
+                        json.dumps(entry["tool_argument_templates"]),
+                        1,
+                        now_iso,
+                        now_iso,
+                    )
+                    for recipe_id, entry, intent_embedding in zip(
+                        recipe_ids, entries, intent_embeddings
+                    )
+                ],
             )
             conn.commit()
         finally:
             conn.close()
         
-        return recipe_id
+        return recipe_ids
     
     def retrieve_recipes(
         self,
@@ -184,33 +290,61 @@ class RecipeStore:
         Returns:
             List of Recipe objects sorted by relevance
         """
-        intent_embedding = self.embedding_model.encode(intent)
+        intent_embedding = self._embed_intent(intent)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
+            # Rank on embeddings alone; the plan JSON is only read for the winners
             cursor = conn.execute(
                 """
-                SELECT recipe_id, schema_fingerprint, intent_template,
-                       intent_embedding, plan_structure, tool_argument_templates,
-                       success_count, created_at, last_used_at
+                SELECT rowid, intent_embedding
                 FROM recipes
                 WHERE schema_fingerprint = ?
                 """,
                 (schema_fingerprint,),
             )
             
-            candidates = []
-            for row in cursor.fetchall():
-                recipe_embedding = np.frombuffer(row[3], dtype=np.float32)
-                
-                similarity = self._cosine_similarity(intent_embedding, recipe_embedding)
-                
-                candidates.append((similarity, row))
+            candidates = cursor.fetchall()
+            if not candidates or top_k <= 0:
+                return []
+            
+            # Score every candidate with one matmul over an (N, D) matrix
+            embedding_matrix = np.frombuffer(
+                b"".join(row[1] for row in candidates), dtype=np.float32
+            ).reshape(len(candidates), -1)
+            scores = self._cosine_similarities(embedding_matrix, intent_embedding)
+            
+            if top_k < len(candidates):
+                # argpartition picks arbitrarily among scores tied at the
+                # cutoff, so keep every candidate scoring at least the k-th
+                # best; flatnonzero returns them in insertion order, which the
+                # stable sort preserves for ties
+                partitioned = np.argpartition(-scores, top_k - 1)[:top_k]
+                top_indices = np.flatnonzero(scores >= scores[partitioned].min())
+            else:
+                top_indices = np.arange(len(candidates))
+            top_indices = top_indices[np.argsort(-scores[top_indices], kind="stable")][:top_k]
+            top_rowids = [candidates[index][0] for index in top_indices]
             
-            candidates.sort(reverse=True, key=lambda x: x[0])
+            placeholders = ",".join("?" * len(top_rowids))
+            cursor = conn.execute(
+                f"""
+                SELECT rowid, recipe_id, schema_fingerprint, intent_template,
+                       intent_embedding, plan_structure, tool_argument_templates,
+                       success_count, created_at, last_used_at
+                FROM recipes
+                WHERE rowid IN ({placeholders})
+                """,
+                top_rowids,
+            )
+            rows_by_rowid = {row[0]: row[1:] for row in cursor.fetchall()}
             
             results = []
-            for _, row in candidates[:top_k]:
+            for rowid in top_rowids:
+                row = rows_by_rowid.get(rowid)
+                if row is None:
+                    # Deleted by another connection between the two queries
+                    continue
                 recipe = Recipe(
                     recipe_id=row[0],
                     schema_fingerprint=row[1],
@@ -234,18 +368,30 @@ class RecipeStore:
         Args:
             recipe_id: Recipe to update
         """
+        self.update_success_counts([recipe_id])
+    
+    def update_success_counts(self, recipe_ids: List[str]) -> None:
+        """Increment success counts for several recipes in one transaction.
+        
+        Args:
+            recipe_ids: Recipes to update; a repeated ID is incremented once
+                       per occurrence
+        """
+        if not recipe_ids:
+            return
+        
         now_iso = datetime.now(timezone.utc).isoformat()
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
-            conn.execute(
+            conn.executemany(
                 """
                 UPDATE recipes
                 SET success_count = success_count + 1,
                     last_used_at = ?
                 WHERE recipe_id = ?
                 """,
-                (now_iso, recipe_id),
+                [(now_iso, recipe_id) for recipe_id in recipe_ids],
             )
             conn.commit()
         finally:
@@ -260,7 +406,7 @@ class RecipeStore:
         Returns:
             Recipe object or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             cursor = conn.execute(
                 """
@@ -300,7 +446,7 @@ class RecipeStore:
         Returns:
             True if recipe was deleted, False if not found
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             cursor = conn.execute(
                 "DELETE FROM recipes WHERE recipe_id = ?",
@@ -325,7 +471,7 @@ class RecipeStore:
         Returns:
             List of Recipe objects sorted by last_used_at DESC
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             if schema_fingerprint:
                 cursor = conn.execute(
@@ -373,26 +519,30 @@ class RecipeStore:
             conn.close()
     
     @staticmethod
-    def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
-        """Compute cosine similarity between vectors.
+    def _cosine_similarities(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Compute cosine similarity between a query and each matrix row.
         
         Args:
-            a: First embedding vector
-            b: Second embedding vector
+            matrix: (N, D) stack of embedding vectors
+            query: (D,) query embedding vector
         
         Returns:
-            Cosine similarity score (-1 to 1)
+            (N,) array of cosine similarity scores (-1 to 1); zero-norm
+            rows or queries score 0.0
         """
-        a = a.astype(np.float32)
-        b = b.astype(np.float32)
+        matrix = matrix.astype(np.float32, copy=False)
+        query = query.astype(np.float32, copy=False)
         
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return np.zeros(matrix.shape[0], dtype=np.float32)
         
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+        row_norms = np.linalg.norm(matrix, axis=1)
+        dots = matrix @ (query / query_norm)
         
-        return float(np.dot(a, b) / (norm_a * norm_b))
+        scores = np.zeros_like(dots)
+        np.divide(dots, row_norms, out=scores, where=row_norms != 0)
+        return scores
     
     def get_stats(self) -> dict:
         """Get recipe store statistics.
@@ -400,7 +550,7 @@ class RecipeStore:
         Returns:
             Dictionary with total_recipes, unique_schemas, total_success_count
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             cursor = conn.execute("""
                 SELECT 
@@ -5,6 +5,7 @@ recipe retrieval based on data structure compatibility.
 """
 
 import hashlib
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
@@ -100,7 +101,7 @@ class SchemaFingerprinter:
         Returns:
             Hexadecimal SHA256 hash string
         """
-        columns = {str(col): str(df[col].dtype) for col in df.columns}
+        columns = {str(col): str(dtype) for col, dtype in zip(df.columns, df.dtypes)}
         return self.compute_fingerprint(columns)
     
     def compute_fingerprint_from_sql_result(
@@ -168,26 +169,28 @@ class SchemaFingerprinter:
             schema2: Second schema (column name -> type)
         
         Returns:
-            Dict with keys: added_columns, removed_columns, changed_types
+            Dict with keys: added_columns, removed_columns, changed_types.
+            Columns are listed in the order they appear in their schema.
         """
-        cols1 = set(schema1.keys())
-        cols2 = set(schema2.keys())
-        
-        added = cols2 - cols1
-        removed = cols1 - cols2
-        common = cols1 & cols2
+        added = [col for col in schema2 if col not in schema1]
+        removed = [col for col in schema1 if col not in schema2]
         
         changed = {}
-        for col in common:
-            type1 = self._normalize_type(schema1[col]) if self.normalize_types else schema1[col]
-            type2 = self._normalize_type(schema2[col]) if self.normalize_types else schema2[col]
+        for col, type1 in schema1.items():
+            if col not in schema2:
+                continue
+            type2 = schema2[col]
+            
+            if self.normalize_types:
+                type1 = self._normalize_type(type1)
+                type2 = self._normalize_type(type2)
             
             if type1 != type2:
                 changed[col] = {"from": type1, "to": type2}
         
         return {
-            "added_columns": list(added),
-            "removed_columns": list(removed),
+            "added_columns": added,
+            "removed_columns": removed,
             "changed_types": changed,
             "is_compatible": len(removed) == 0 and len(changed) == 0,
         }
@@ -213,8 +216,15 @@ def compute_schema_fingerprint(df: pd.DataFrame) -> str:
         >>> len(fp)
         64
     """
+    schema = tuple((str(col), str(dtype)) for col, dtype in zip(df.columns, df.dtypes))
+    return _fingerprint_schema(schema)
+
+
+@lru_cache(maxsize=512)
+def _fingerprint_schema(schema: Tuple[Tuple[str, str], ...]) -> str:
+    """Fingerprint a (column, dtype) tuple, memoized since it depends only on schema."""
     fingerprinter = SchemaFingerprinter(normalize_types=True)
-    return fingerprinter.compute_fingerprint_from_dataframe(df)
+    return fingerprinter.compute_fingerprint(dict(schema))
 
 
 def schema_compatible(fp1: str, fp2: str) -> bool:
@@ -101,6 +101,20 @@ class IntentParser:
             messages=[{"role": "user", "content": user_message}],
         )
         
+        return self._parse_response(response)
+    
+    def _parse_response(self, response: Any) -> ParsedIntent:
+        """Convert an LLM messages response into a validated ParsedIntent.
+        
+        Args:
+            response: Anthropic messages response with text content blocks
+        
+        Returns:
+            ParsedIntent built from the JSON object in the response text
+        
+        Raises:
+            ValueError: If the response has no valid intent JSON
+        """
         # Safely extract text content from possibly mixed content blocks
         content_blocks = getattr(response, "content", []) or []
         text_parts = []
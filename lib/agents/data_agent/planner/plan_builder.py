@@ -3,6 +3,8 @@
 Constructs validated DAGs from parsed intents with tool mapping and cost estimates.
 """
 
+import re
+from collections import deque
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Set, Union
 from enum import Enum
@@ -74,6 +76,14 @@ class PlanBuilder:
         ToolType.PROFILER: 0.5,
     }
     
+    # Keyword alternations checked in order against the lowercased operation;
+    # plain substrings, so "selection" still matches "select".
+    _TOOL_KEYWORD_PATTERNS = (
+        (re.compile("query|select|fetch|sql"), ToolType.SQL_RUNNER),
+        (re.compile("plot|chart|visualize|graph"), ToolType.PLOTTER),
+        (re.compile("profile|schema|discover"), ToolType.PROFILER),
+    )
+    
     def build_plan(
         self,
         objective: str,
@@ -195,14 +205,10 @@ class PlanBuilder:
         """
         operation_lower = operation.lower()
         
-        if any(kw in operation_lower for kw in ["query", "select", "fetch", "sql"]):
-            return ToolType.SQL_RUNNER
-        elif any(kw in operation_lower for kw in ["plot", "chart", "visualize", "graph"]):
-            return ToolType.PLOTTER
-        elif any(kw in operation_lower for kw in ["profile", "schema", "discover"]):
-            return ToolType.PROFILER
-        else:
-            return ToolType.DF_OPERATIONS
+        for pattern, tool in self._TOOL_KEYWORD_PATTERNS:
+            if pattern.search(operation_lower):
+                return tool
+        return ToolType.DF_OPERATIONS
     
     def _extract_invariants(
         self,
@@ -238,31 +244,32 @@ class PlanBuilder:
             raise ValueError("Plan contains cycle - DAG validation failed")
     
     def _has_cycle(self, steps: List[PlanStep]) -> bool:
-        """Check for cycles using DFS."""
-        adj = {step.step_id: step.dependencies for step in steps}
-        visited = set()
-        rec_stack = set()
+        """Check for cycles using Kahn's algorithm.
         
-        def dfs(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in adj.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            
-            rec_stack.remove(node)
-            return False
+        Runs in O(V + E) without recursion, so long plans cannot hit the
+        interpreter recursion limit.
+        """
+        dep_count: Dict[str, int] = {step.step_id: 0 for step in steps}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in dep_count}
         
         for step in steps:
-            if step.step_id not in visited:
-                if dfs(step.step_id):
-                    return True
+            for dep in step.dependencies:
+                if dep in dependents:
+                    dep_count[step.step_id] += 1
+                    dependents[dep].append(step.step_id)
+        
+        ready = deque(step_id for step_id, count in dep_count.items() if count == 0)
+        resolved = 0
+        
+        while ready:
+            node = ready.popleft()
+            resolved += 1
+            for dependent in dependents[node]:
+                dep_count[dependent] -= 1
+                if dep_count[dependent] == 0:
+                    ready.append(dependent)
         
-        return False
+        return resolved != len(dep_count)
     
     def add_step(
         self,
@@ -4,8 +4,33 @@ Implements FR-016 to FR-021: DDL/DML blocking, PII detection, column access cont
 """
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import List, Set, Optional, Dict, Any
+from functools import lru_cache
+from typing import List, Set, Optional, Dict, Any, Tuple
+
+
+def _wildcard_to_regex(pattern: str) -> str:
+    """Translate a column wildcard pattern (e.g., "users.*") to regex source."""
+    return pattern.replace('.', r'\.').replace('*', '.*')
+
+
+@lru_cache(maxsize=256)
+def _compile_wildcard(pattern: str) -> re.Pattern:
+    """Compile a column wildcard pattern (e.g., "users.*") to an anchored regex."""
+    return re.compile(f'^{_wildcard_to_regex(pattern)}$')
+
+
+@lru_cache(maxsize=256)
+def _compile_wildcard_union(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile wildcard patterns into one regex for use with fullmatch().
+    
+    Each pattern becomes a named group ``p<index>``, so ``match.lastgroup``
+    identifies the first pattern in the tuple that matched.
+    """
+    return re.compile('|'.join(
+        f'(?P<p{index}>{_wildcard_to_regex(pattern)})' for index, pattern in enumerate(patterns)
+    ))
 
 
 @dataclass
@@ -45,6 +70,18 @@ class SQLPolicyChecker:
         "LOAD", "COPY", "IMPORT", "EXPORT",
     }
     
+    # One compiled alternation scans for every keyword in a single pass
+    _KEYWORD_GROUPS = (
+        ("DDL", DDL_KEYWORDS),
+        ("DML", DML_KEYWORDS),
+        ("Dangerous", DANGEROUS_KEYWORDS),
+    )
+    _KEYWORD_PATTERN = re.compile(
+        r'\b(' + '|'.join(sorted(DDL_KEYWORDS | DML_KEYWORDS | DANGEROUS_KEYWORDS, key=len, reverse=True)) + r')\b'
+    )
+    _COMMENT_PATTERN = re.compile(r"'(?:[^']|'')*'|--")
+    _SEMICOLON_PATTERN = re.compile(r"'(?:[^']|'')*'|;")
+    
     def check_query(self, query: str) -> PolicyResult:
         """Check SQL query for policy violations.
         
@@ -58,25 +95,16 @@ class SQLPolicyChecker:
         violations = []
         severity = "none"
         
-        for keyword in self.DDL_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', query_upper):
-                violations.append(f"DDL operation blocked: {keyword}")
-                severity = "critical"
-        
-        for keyword in self.DML_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', query_upper):
-                violations.append(f"DML operation blocked: {keyword}")
-                severity = "critical"
-        
-        for keyword in self.DANGEROUS_KEYWORDS:
-            if re.search(rf'\b{keyword}\b', query_upper):
-                violations.append(f"Dangerous operation blocked: {keyword}")
+        found_keywords = set(self._KEYWORD_PATTERN.findall(query_upper))
+        for label, keywords in self._KEYWORD_GROUPS:
+            for keyword in sorted(found_keywords & keywords):
+                violations.append(f"{label} operation blocked: {keyword}")
                 severity = "critical"
         
         # Check for SQL comments outside of string literals
         if not query.strip().startswith('--'):
             # Match string literals or comments, check if comment appears first
-            match = re.search(r"'(?:[^']|'')*'|--", query)
+            match = self._COMMENT_PATTERN.search(query)
             if match and match.group(0) == '--':
                 violations.append("SQL comment detected (potential injection)")
                 severity = max(severity, "high", key=lambda x: ["none", "low", "medium", "high", "critical"].index(x))
@@ -85,7 +113,7 @@ class SQLPolicyChecker:
         stripped = query.strip().rstrip(';')
         if stripped:
             # Match string literals or semicolons, check if semicolon appears outside literals
-            match = re.search(r"'(?:[^']|'')*'|;", stripped)
+            match = self._SEMICOLON_PATTERN.search(stripped)
             if match and match.group(0) == ';':
                 violations.append("Multiple statements detected (potential injection)")
                 severity = max(severity, "high", key=lambda x: ["none", "low", "medium", "high", "critical"].index(x))
@@ -114,6 +142,14 @@ class PIIDetector:
     
     PHONE_PATTERN = re.compile(r'\b(?:\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})\b')
     
+    # Detection order within a text: (pii_type, pattern, confidence)
+    _PII_PATTERNS = (
+        ("ssn", SSN_PATTERN, 0.95),
+        ("credit_card", CREDIT_CARD_PATTERN, 0.90),
+        ("email", EMAIL_PATTERN, 0.85),
+        ("phone", PHONE_PATTERN, 0.80),
+    )
+    
     def detect_pii(self, text: str, location: str = "unknown") -> List[PIIMatch]:
         """Detect PII in text.
         
@@ -124,42 +160,50 @@ class PIIDetector:
         Returns:
             List of detected PII matches
         """
-        matches = []
-        
-        for match in self.SSN_PATTERN.finditer(str(text)):
-            matches.append(PIIMatch(
-                pii_type="ssn",
-                value=match.group(),
-                location=location,
-                confidence=0.95,
-            ))
-        
-        for match in self.CREDIT_CARD_PATTERN.finditer(str(text)):
-            if self._luhn_check(match.group().replace('-', '').replace(' ', '')):
-                matches.append(PIIMatch(
-                    pii_type="credit_card",
-                    value=match.group(),
-                    location=location,
-                    confidence=0.90,
+        return self.detect_pii_batch([str(text)], [location])
+    
+    def detect_pii_batch(self, texts: List[str], locations: List[str]) -> List[PIIMatch]:
+        """Detect PII in many texts with one regex pass per pattern.
+        
+        Texts are joined with NUL separators, which none of the patterns can
+        match or cross, and each match is mapped back to its text by offset.
+        Results are ordered as if detect_pii had been called on each text in
+        turn.
+        
+        Args:
+            texts: Texts to scan
+            locations: Location descriptor for each text
+        
+        Returns:
+            List of detected PII matches
+        """
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        buffer = "\0".join(texts)
+        
+        found = []
+        for pattern_order, (pii_type, pattern, confidence) in enumerate(self._PII_PATTERNS):
+            for match in pattern.finditer(buffer):
+                value = match.group()
+                if pii_type == "credit_card" and not self._luhn_check(value.replace('-', '').replace(' ', '')):
+                    continue
+                
+                text_index = bisect_right(starts, match.start()) - 1
+                found.append((
+                    (text_index, pattern_order, match.start()),
+                    PIIMatch(
+                        pii_type=pii_type,
+                        value=value,
+                        location=locations[text_index],
+                        confidence=confidence,
+                    ),
                 ))
         
-        for match in self.EMAIL_PATTERN.finditer(str(text)):
-            matches.append(PIIMatch(
-                pii_type="email",
-                value=match.group(),
-                location=location,
-                confidence=0.85,
-            ))
-        
-        for match in self.PHONE_PATTERN.finditer(str(text)):
-            matches.append(PIIMatch(
-                pii_type="phone",
-                value=match.group(),
-                location=location,
-                confidence=0.80,
-            ))
-        
-        return matches
+        found.sort(key=lambda item: item[0])
+        return [pii_match for _, pii_match in found]
     
     def _luhn_check(self, card_number: str) -> bool:
         """Validate credit card using Luhn algorithm."""
@@ -217,8 +261,10 @@ class ColumnAccessControl:
         full_name = f"{table}.{column}"
         violations = []
         
-        for pattern in self.blocked_patterns:
-            if self._matches_pattern(full_name, pattern):
+        if self.blocked_patterns:
+            blocked = _compile_wildcard_union(tuple(self.blocked_patterns)).fullmatch(full_name)
+            if blocked:
+                pattern = self.blocked_patterns[int(blocked.lastgroup[1:])]
                 violations.append(f"Column access denied: {full_name} (blocked by pattern: {pattern})")
                 return PolicyResult(
                     allowed=False,
@@ -228,7 +274,7 @@ class ColumnAccessControl:
                 )
         
         if self.allowed_patterns:
-            allowed = any(self._matches_pattern(full_name, pattern) for pattern in self.allowed_patterns)
+            allowed = _compile_wildcard_union(tuple(self.allowed_patterns)).fullmatch(full_name) is not None
             
             if not allowed:
                 violations.append(f"Column access denied: {full_name} (not in whitelist)")
@@ -256,10 +302,7 @@ class ColumnAccessControl:
         Returns:
             True if matches
         """
-        pattern_regex = pattern.replace('.', r'\.').replace('*', '.*')
-        pattern_regex = f'^{pattern_regex}$'
-        
-        return bool(re.match(pattern_regex, name))
+        return _compile_wildcard(pattern).match(name) is not None
 
 
 class PolicyEnforcer:
@@ -300,6 +343,17 @@ class PolicyEnforcer:
         
         return result
     
+    def validate_queries(self, queries: List[str]) -> List[PolicyResult]:
+        """Validate several SQL queries against all policies.
+        
+        Args:
+            queries: SQL query strings
+        
+        Returns:
+            PolicyResult for each query, in input order
+        """
+        return [self.validate_query(query) for query in queries]
+    
     def scan_data_for_pii(
         self,
         data: List[Dict[str, Any]],
@@ -314,15 +368,15 @@ class PolicyEnforcer:
         Returns:
             List of detected PII matches
         """
-        all_matches = []
+        texts = []
+        locations = []
         
         for row_idx, row in enumerate(data):
             for col_name, value in row.items():
-                location = f"{table_name}.{col_name}[row={row_idx}]"
-                matches = self.pii_detector.detect_pii(str(value), location)
-                all_matches.extend(matches)
+                texts.append(str(value))
+                locations.append(f"{table_name}.{col_name}[row={row_idx}]")
         
-        return all_matches
+        return self.pii_detector.detect_pii_batch(texts, locations)
     
     def validate_column_access(
         self,
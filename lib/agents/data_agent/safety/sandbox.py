@@ -4,6 +4,7 @@ Implements FR-024 to FR-026: Sandbox execution, timeout enforcement, resource mo
 """
 
 import signal
+import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -60,6 +61,7 @@ class SandboxExecutor:
         """
         self.quota = quota or ResourceQuota()
         self._process = psutil.Process()
+        self._cpu_mark = (time.perf_counter(), time.process_time())
     
     def execute_in_sandbox(
         self,
@@ -77,7 +79,7 @@ class SandboxExecutor:
         Returns:
             SandboxResult with execution metrics
         """
-        start_time = time.time()
+        cpu_mark = (time.perf_counter(), time.process_time())
         violations = []
         
         initial_memory = self._get_memory_usage_mb()
@@ -89,23 +91,22 @@ class SandboxExecutor:
         success = False
         
         try:
-            with self._timeout_handler(self.quota.max_execution_seconds):
-                memory_before = self._get_memory_usage_mb()
-                
-                result = func(*args, **kwargs)
-                
-                memory_after = self._get_memory_usage_mb()
-                peak_memory = max(peak_memory, memory_after)
-                
-                if memory_after - initial_memory > self.quota.max_memory_mb:
-                    violations.append(
-                        f"Memory usage exceeded limit: "
-                        f"{memory_after - initial_memory:.1f}MB > {self.quota.max_memory_mb}MB"
-                    )
-                
-                cpu_samples.append(self._process.cpu_percent(interval=0.1))
-                
-                success = True
+            result = self._run_with_timeout(
+                func, args, kwargs, self.quota.max_execution_seconds
+            )
+            
+            memory_after = self._get_memory_usage_mb()
+            peak_memory = max(peak_memory, memory_after)
+            
+            if memory_after - initial_memory > self.quota.max_memory_mb:
+                violations.append(
+                    f"Memory usage exceeded limit: "
+                    f"{memory_after - initial_memory:.1f}MB > {self.quota.max_memory_mb}MB"
+                )
+            
+            cpu_samples.append(self._cpu_percent_since(*cpu_mark))
+            
+            success = True
         
         except SandboxTimeoutError as e:
             error = f"Execution timeout: {str(e)}"
@@ -119,7 +120,7 @@ class SandboxExecutor:
             error = f"Execution error: {str(e)}"
             success = False
         
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - cpu_mark[0]
         avg_cpu = sum(cpu_samples) / len(cpu_samples) if cpu_samples else 0.0
         
         return SandboxResult(
@@ -132,9 +133,65 @@ class SandboxExecutor:
             violations=violations,
         )
     
+    def _run_with_timeout(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        seconds: float,
+    ) -> Any:
+        """Run func, raising SandboxTimeoutError once seconds have elapsed.
+        
+        On the main thread of a POSIX process func runs in place under a
+        SIGALRM interval timer, so a timeout interrupts it and objects bound
+        to the calling thread (e.g. sqlite3 connections) keep working.
+        Signals can only be handled on the main thread, so elsewhere (and on
+        platforms without SIGALRM) func runs in a daemon worker thread that
+        is waited on for at most seconds. A timed-out worker cannot be
+        stopped; it is abandoned and does not block interpreter exit.
+        
+        Args:
+            func: Function to execute
+            args: Positional arguments for func
+            kwargs: Keyword arguments for func
+            seconds: Timeout in seconds
+        
+        Returns:
+            Return value of func
+        
+        Raises:
+            SandboxTimeoutError: If execution exceeds timeout
+        """
+        if hasattr(signal, "SIGALRM") and threading.current_thread() is threading.main_thread():
+            with self._timeout_handler(seconds):
+                return func(*args, **kwargs)
+        
+        outcome = {}
+        
+        def target():
+            try:
+                outcome["result"] = func(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+        
+        worker = threading.Thread(target=target, name="sandbox-executor", daemon=True)
+        worker.start()
+        worker.join(seconds)
+        
+        if worker.is_alive():
+            raise SandboxTimeoutError(f"Execution exceeded {seconds}s timeout")
+        
+        if "error" in outcome:
+            raise outcome["error"]
+        
+        return outcome["result"]
+    
     @contextmanager
     def _timeout_handler(self, seconds: float):
-        """Context manager for timeout enforcement.
+        """Context manager for SIGALRM timeout enforcement on the main thread.
+        
+        Uses an ITIMER_REAL interval timer rather than signal.alarm(), which
+        only takes whole seconds and would disable sub-second timeouts.
         
         Args:
             seconds: Timeout in seconds
@@ -146,12 +203,12 @@ class SandboxExecutor:
             raise SandboxTimeoutError(f"Execution exceeded {seconds}s timeout")
         
         old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(int(seconds))
+        signal.setitimer(signal.ITIMER_REAL, seconds)
         
         try:
             yield
         finally:
-            signal.alarm(0)
+            signal.setitimer(signal.ITIMER_REAL, 0)
             signal.signal(signal.SIGALRM, old_handler)
     
     def _get_memory_usage_mb(self) -> float:
@@ -162,15 +219,31 @@ class SandboxExecutor:
         except Exception:
             return 0.0
     
+    def _cpu_percent_since(self, wall_start: float, cpu_start: float) -> float:
+        """Get process CPU usage since a (perf_counter, process_time) mark.
+        
+        Computed from CPU time deltas rather than psutil's interval sampling,
+        so it never blocks. May exceed 100 when several threads run at once.
+        """
+        elapsed = time.perf_counter() - wall_start
+        if elapsed <= 0:
+            return 0.0
+        return (time.process_time() - cpu_start) / elapsed * 100
+    
     def monitor_resources(self) -> Dict[str, float]:
         """Get current resource usage metrics.
         
+        CPU usage covers the time since the previous call, or since the
+        executor was created on the first call.
+        
         Returns:
             Dict with memory_mb, cpu_percent
         """
+        cpu_percent = self._cpu_percent_since(*self._cpu_mark)
+        self._cpu_mark = (time.perf_counter(), time.process_time())
         return {
             "memory_mb": self._get_memory_usage_mb(),
-            "cpu_percent": self._process.cpu_percent(interval=0.1),
+            "cpu_percent": cpu_percent,
         }
 
 
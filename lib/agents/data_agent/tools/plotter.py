@@ -4,7 +4,9 @@ Generates matplotlib/plotly charts and saves to artifacts directory.
 """
 
 import hashlib
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
@@ -12,6 +14,7 @@ import pandas as pd
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -47,14 +50,19 @@ class Plotter:
     - Heatmaps
     """
     
-    def __init__(self, artifacts_dir: Union[str, Path]):
+    def __init__(self, artifacts_dir: Union[str, Path], dpi: int = 150):
         """Initialize plotter.
         
         Args:
             artifacts_dir: Directory to save generated plots
+            dpi: Resolution of saved matplotlib PNGs; lower renders faster
         """
         self.artifacts_dir = Path(artifacts_dir)
+        self.dpi = dpi
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._figure: Optional[Figure] = None
+        self._figure_lock = threading.Lock()
     
     def line_chart(
         self,
@@ -174,21 +182,20 @@ class Plotter:
                 fig = px.scatter(df, x=x, y=y, color=color, size=size, title=title, **kwargs)
                 return self._save_plotly_figure(fig, "scatter", start_time)
             elif backend == "matplotlib":
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                if color:
-                    scatter = ax.scatter(df[x], df[y], c=df[color], cmap='viridis', alpha=0.6)
-                    plt.colorbar(scatter, label=color)
-                else:
-                    ax.scatter(df[x], df[y], alpha=0.6)
-                
-                ax.set_xlabel(x)
-                ax.set_ylabel(y)
-                if title:
-                    ax.set_title(title)
-                plt.tight_layout()
-                
-                return self._save_matplotlib_figure(fig, "scatter", start_time)
+                with self._matplotlib_axes() as (fig, ax):
+                    if color:
+                        scatter = ax.scatter(df[x], df[y], c=df[color], cmap='viridis', alpha=0.6)
+                        fig.colorbar(scatter, ax=ax, label=color)
+                    else:
+                        ax.scatter(df[x], df[y], alpha=0.6)
+                    
+                    ax.set_xlabel(x)
+                    ax.set_ylabel(y)
+                    if title:
+                        ax.set_title(title)
+                    fig.tight_layout()
+                    
+                    return self._save_matplotlib_figure(fig, "scatter", start_time)
             else:
                 raise PlotGenerationError(
                     f"Unsupported backend: {backend}",
@@ -212,21 +219,20 @@ class Plotter:
     ) -> PlotResult:
         """Generate matplotlib line chart."""
         
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        y_cols = [y] if isinstance(y, str) else y
-        for col in y_cols:
-            ax.plot(df[x], df[col], label=col, **kwargs)
-        
-        ax.set_xlabel(x)
-        ax.set_ylabel('Value')
-        if title:
-            ax.set_title(title)
-        if len(y_cols) > 1:
-            ax.legend()
-        plt.tight_layout()
-        
-        return self._save_matplotlib_figure(fig, "line", start_time)
+        with self._matplotlib_axes() as (fig, ax):
+            y_cols = [y] if isinstance(y, str) else y
+            for col in y_cols:
+                ax.plot(df[x], df[col], label=col, **kwargs)
+            
+            ax.set_xlabel(x)
+            ax.set_ylabel('Value')
+            if title:
+                ax.set_title(title)
+            if len(y_cols) > 1:
+                ax.legend()
+            fig.tight_layout()
+            
+            return self._save_matplotlib_figure(fig, "line", start_time)
     
     def _plotly_line_chart(
         self,
@@ -264,16 +270,16 @@ class Plotter:
     ) -> PlotResult:
         """Generate matplotlib bar chart."""
         
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.bar(df[x], df[y], **kwargs)
-        ax.set_xlabel(x)
-        ax.set_ylabel(y)
-        if title:
-            ax.set_title(title)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        
-        return self._save_matplotlib_figure(fig, "bar", start_time)
+        with self._matplotlib_axes() as (fig, ax):
+            ax.bar(df[x], df[y], **kwargs)
+            ax.set_xlabel(x)
+            ax.set_ylabel(y)
+            if title:
+                ax.set_title(title)
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            fig.tight_layout()
+            
+            return self._save_matplotlib_figure(fig, "bar", start_time)
     
     def _plotly_bar_chart(
         self,
@@ -290,6 +296,22 @@ class Plotter:
         
         return self._save_plotly_figure(fig, "bar", start_time)
     
+    @contextmanager
+    def _matplotlib_axes(self):
+        """Yield (figure, axes) on this plotter's reusable figure.
+        
+        The Figure is created once per Plotter (outside pyplot's figure
+        registry) and cleared between charts; the lock keeps concurrent
+        renders from drawing onto the same canvas.
+        """
+        with self._figure_lock:
+            if self._figure is None:
+                self._figure = Figure(figsize=(10, 6))
+            else:
+                self._figure.clear()
+            
+            yield self._figure, self._figure.add_subplot()
+    
     def _save_matplotlib_figure(
         self,
         fig: matplotlib.figure.Figure,
@@ -303,8 +325,7 @@ class Plotter:
         filename = f"{artifact_id}_{plot_type}.png"
         file_path = self.artifacts_dir / filename
         
-        fig.savefig(file_path, dpi=150, bbox_inches='tight')
-        plt.close(fig)
+        fig.savefig(file_path, dpi=self.dpi, bbox_inches='tight')
         
         content_hash = self._compute_file_hash(file_path)
         size_bytes = file_path.stat().st_size
@@ -351,8 +372,5 @@ class Plotter:
     
     def _compute_file_hash(self, file_path: Path) -> str:
         """Compute SHA256 hash of file content."""
-        sha256 = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                sha256.update(chunk)
-        return sha256.hexdigest()
\ No newline at end of file
+            return hashlib.file_digest(f, "sha256").hexdigest()
\ No newline at end of file
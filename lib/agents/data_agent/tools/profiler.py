@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 import numpy as np
 
-from ..memory.schema_fingerprint import SchemaFingerprinter
+from ..memory.schema_fingerprint import compute_schema_fingerprint
 
 
 @dataclass
@@ -247,5 +247,4 @@ class DataProfiler:
         Returns:
             SHA256 hash of sorted column names and types
         """
-        fingerprinter = SchemaFingerprinter(normalize_types=True)
-        return fingerprinter.compute_fingerprint_from_dataframe(df)
\ No newline at end of file
+        return compute_schema_fingerprint(df)
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""Shared fixtures for contract tests.
+
+The request/response JSON schemas are parsed once (via functools.cache) and
+their metaschema-checked validators are built on first use by session-scoped
+fixtures, so jsonschema is only imported when a schema test actually runs
+rather than while pytest collects the whole suite. Nothing here is mutated
+afterwards, so each pytest-xdist worker builds its own copy once and the suite
+can be spread across cores with ``pytest -n auto tests/contract/``.
+"""
+
+import json
+import uuid
+from functools import cache
+from pathlib import Path
+
+import pytest
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+CONTRACTS_DIR = Path(__file__).parents[2] / "specs" / "001-build-an-autonomous" / "contracts"
+
+# Minimal valid payloads behind the make_* fixtures; the builders return
+# copies, so tests never mutate these.
+BASE_REQUEST = {
+    "request_id": str(uuid.uuid4()),
+    "intent": "Analyze data",
+    "data_sources": [{"type": "sql", "connection_string": "test"}],
+    "deliverables": ["tables"],
+}
+
+BASE_ARTIFACT = {
+    "artifact_id": str(uuid.uuid4()),
+    "artifact_type": "table",
+    "content_ref": "test",
+    "content_hash": "d3f5a7b9c1e3d5f7a9b1c3e5d7f9a1b3c5e7d9f1a3b5c7d9e1f3a5b7c9d1e3f5",
+}
+
+# Without artifacts or error; tests add whichever their status needs.
+BASE_RESPONSE = {
+    "request_id": BASE_REQUEST["request_id"],
+    "status": "completed",
+    "summary": {
+        "key_findings": [],
+        "insights": "Test",
+        "warnings": []
+    },
+    "metrics": {
+        "execution_time_seconds": 1.0,
+        "tool_calls_count": 1
+    },
+    "audit_log_ref": "test",
+}
+
+
+def _read_json(path):
+    """Parse a JSON file, using orjson's C decoder when it is installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text())
+
+
+@cache
+def load_request_schema():
+    """Load AnalysisRequest JSON schema from specs."""
+    return _read_json(CONTRACTS_DIR / "request.json")
+
+
+@cache
+def load_response_schema():
+    """Load AnalysisResponse JSON schema from specs."""
+    return _read_json(CONTRACTS_DIR / "response.json")
+
+
+def build_validator(schema):
+    """Check schema against its metaschema and return a validator for it.
+
+    The validator asserts ``format`` keywords (e.g. uuid) so positive and
+    negative tests, which both go through it, apply the same format rules.
+    """
+    jsonschema = pytest.importorskip("jsonschema")
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    # A checker with every known format, not the draft's own: draft-07 has
+    # no "uuid" format, yet the contracts use it.
+    return validator_cls(schema, format_checker=jsonschema.FormatChecker())
+
+
+@pytest.fixture(scope="session")
+def request_schema():
+    return load_request_schema()
+
+
+@pytest.fixture(scope="session")
+def response_schema():
+    return load_response_schema()
+
+
+@pytest.fixture(scope="session")
+def request_validator(request_schema):
+    return build_validator(request_schema)
+
+
+@pytest.fixture(scope="session")
+def response_validator(response_schema):
+    return build_validator(response_schema)
+
+
+@pytest.fixture(scope="session")
+def validate_request(request_validator):
+    return request_validator.validate
+
+
+@pytest.fixture(scope="session")
+def validate_response(response_validator):
+    return response_validator.validate
+
+
+def _builder(base):
+    """Return build(**overrides), which copies base with top-level fields overridden."""
+    def build(**overrides):
+        return {**base, **overrides}
+    return build
+
+
+@pytest.fixture(scope="session")
+def make_request():
+    return _builder(BASE_REQUEST)
+
+
+@pytest.fixture(scope="session")
+def make_artifact():
+    return _builder(BASE_ARTIFACT)
+
+
+@pytest.fixture(scope="session")
+def make_response():
+    return _builder(BASE_RESPONSE)
@@ -23,12 +23,15 @@ class TestObservationContracts:
             retry_count=0,
         )
         
-        assert hasattr(obs, 'step_id')
-        assert hasattr(obs, 'status')
-        assert hasattr(obs, 'result')
-        assert hasattr(obs, 'error_message')
-        assert hasattr(obs, 'retry_count')
-        assert hasattr(obs, 'metadata')
+        required_fields = {
+            "step_id",
+            "status",
+            "result",
+            "error_message",
+            "retry_count",
+            "metadata",
+        }
+        assert required_fields <= vars(obs).keys()
     
     def test_observation_is_success_method(self):
         """Observation.is_success() must return bool based on status."""
@@ -78,9 +81,8 @@ class TestToolCallContracts:
             step_id="step-1",
         )
         
-        assert hasattr(tool_call, 'tool_name')
-        assert hasattr(tool_call, 'arguments')
-        assert hasattr(tool_call, 'step_id')
+        required_fields = {"tool_name", "arguments", "step_id"}
+        assert required_fields <= vars(tool_call).keys()
         assert isinstance(tool_call.arguments, dict)
 
 
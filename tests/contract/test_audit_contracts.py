@@ -1,8 +1,6 @@
 """Contract tests for Audit system."""
 
 import pytest
-from pathlib import Path
-import tempfile
 import json
 
 from lib.agents.data_agent.audit import MerkleLog, LogEntry, AuditTracer, EventType
@@ -21,12 +19,15 @@ class TestMerkleLogContracts:
             parent_hash="0" * 64,
         )
         
-        assert hasattr(entry, "entry_id")
-        assert hasattr(entry, "timestamp")
-        assert hasattr(entry, "event_type")
-        assert hasattr(entry, "data")
-        assert hasattr(entry, "parent_hash")
-        assert hasattr(entry, "entry_hash")
+        required_fields = {
+            "entry_id",
+            "timestamp",
+            "event_type",
+            "data",
+            "parent_hash",
+            "entry_hash",
+        }
+        assert required_fields <= vars(entry).keys()
     
     def test_compute_hash_deterministic(self):
         """compute_hash() must produce same hash for same input."""
@@ -52,102 +53,154 @@ class TestMerkleLogContracts:
         assert hash1 == hash2
         assert len(hash1) == 64
     
-    def test_merkle_log_initialization(self):
+    def test_merkle_log_initialization(self, tmp_path):
         """MerkleLog must initialize with empty or existing log."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log_path = Path(tmpdir) / "test.jsonl"
-            log = MerkleLog(str(log_path))
-            
-            assert log.log_path == log_path
-            assert log_path.parent.exists()
+        log_path = tmp_path / "test.jsonl"
+        log = MerkleLog(log_path)
+        
+        assert log.log_path == log_path
+        assert log_path.parent.exists()
     
-    def test_append_returns_log_entry(self):
+    def test_append_returns_log_entry(self, tmp_path):
         """append() must return LogEntry with computed hash."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            entry = log.append(
-                entry_id="test-1",
-                event_type="test",
-                data={"key": "value"},
-            )
-            
-            assert isinstance(entry, LogEntry)
-            assert entry.entry_hash is not None
-            assert len(entry.entry_hash) == 64
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        entry = log.append(
+            entry_id="test-1",
+            event_type="test",
+            data={"key": "value"},
+        )
+        
+        assert isinstance(entry, LogEntry)
+        assert entry.entry_hash is not None
+        assert len(entry.entry_hash) == 64
     
-    def test_genesis_entry_parent_hash(self):
+    def test_genesis_entry_parent_hash(self, tmp_path):
         """First entry must have genesis parent hash."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            entry = log.append("test-1", "test", {})
-            
-            assert entry.parent_hash == MerkleLog.GENESIS_HASH
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        entry = log.append("test-1", "test", {})
+        
+        assert entry.parent_hash == MerkleLog.GENESIS_HASH
     
-    def test_chain_links_entries(self):
+    def test_chain_links_entries(self, tmp_path):
         """Second entry must link to first via parent_hash."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            entry1 = log.append("test-1", "test", {})
-            entry2 = log.append("test-2", "test", {})
-            
-            assert entry2.parent_hash == entry1.entry_hash
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        entry1 = log.append("test-1", "test", {})
+        entry2 = log.append("test-2", "test", {})
+        
+        assert entry2.parent_hash == entry1.entry_hash
     
-    def test_verify_chain_valid(self):
+    def test_verify_chain_valid(self, tmp_path):
         """verify_chain() must return (True, None) for valid chain."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            log.append("test-1", "test", {})
-            log.append("test-2", "test", {})
-            
-            is_valid, error = log.verify_chain()
-            
-            assert is_valid is True
-            assert error is None
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        log.append("test-1", "test", {})
+        log.append("test-2", "test", {})
+        
+        is_valid, error = log.verify_chain()
+        
+        assert is_valid is True
+        assert error is None
     
-    def test_get_entries_filters(self):
+    def test_get_entries_filters(self, tmp_path):
         """get_entries() must support event_type and entry_id_prefix filters."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            log.append("req-1-event", "type_a", {})
-            log.append("req-1-other", "type_b", {})
-            log.append("req-2-event", "type_a", {})
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        log.append("req-1-event", "type_a", {})
+        log.append("req-1-other", "type_b", {})
+        log.append("req-2-event", "type_a", {})
+        
+        by_type = log.get_entries(event_type="type_a")
+        assert len(by_type) == 2
+        
+        by_prefix = log.get_entries(entry_id_prefix="req-1")
+        assert len(by_prefix) == 2
+    
+    def test_get_entries_prefix_matches_entry_id_only(self, tmp_path):
+        """get_entries() prefix filter must match entry_id, including escaped characters."""
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        log.append("req-1-event", "type_a", {})
+        log.append("req-2-event", "type_a", {"parent": "req-1-event"})
+        log.append('réq "3"-event', "type_a", {})
+        
+        assert [e.entry_id for e in log.get_entries(entry_id_prefix="req-1")] == ["req-1-event"]
+        assert [e.entry_id for e in log.get_entries(entry_id_prefix='réq "3"')] == ['réq "3"-event']
+    
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param({"value": float("nan")}, id="nan"),
+            pytest.param({"value": 2**70}, id="big_int"),
+            pytest.param({"text": "héllo 日本"}, id="non_ascii"),
+        ],
+    )
+    def test_stored_entries_rehash_to_entry_hash(self, tmp_path, data):
+        """Values accepted by compute_hash() must be stored so verify_chain() passes."""
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        log.append("test-1", "test", data)
+        
+        assert log.verify_chain() == (True, None)
+    
+    def test_reopen_links_after_non_ascii_entries(self, tmp_path):
+        """Reopening must resume the chain when the tail window splits a multibyte character."""
+        log_path = tmp_path / "test.jsonl"
+        for offset in range(4):
+            log_path.unlink(missing_ok=True)
+            log = MerkleLog(log_path)
+            log.append("test-1", "test", {"text": "x" * offset + "日本語" * 2000})
+            log.append("test-2", "test", {"text": "日本語"})
             
-            by_type = log.get_entries(event_type="type_a")
-            assert len(by_type) == 2
+            MerkleLog(log_path).append("test-3", "test", {})
             
-            by_prefix = log.get_entries(entry_id_prefix="req-1")
-            assert len(by_prefix) == 2
+            assert MerkleLog(log_path).verify_chain() == (True, None)
     
-    def test_get_stats_structure(self):
+    def test_get_stats_structure(self, tmp_path):
         """get_stats() must return dict with expected keys."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            log = MerkleLog(str(Path(tmpdir) / "test.jsonl"))
-            
-            log.append("test-1", "type_a", {})
-            log.append("test-2", "type_b", {})
-            
-            stats = log.get_stats()
-            
-            assert "total_entries" in stats
-            assert "by_event_type" in stats
-            assert "chain_valid" in stats
-            assert stats["total_entries"] == 2
+        log = MerkleLog(tmp_path / "test.jsonl")
+        
+        log.append("test-1", "type_a", {})
+        log.append("test-2", "type_b", {})
+        
+        stats = log.get_stats()
+        
+        assert "total_entries" in stats
+        assert "by_event_type" in stats
+        assert "chain_valid" in stats
+        assert stats["total_entries"] == 2
+    
+    def test_buffered_log_flushes_before_reads_and_on_close(self, tmp_path):
+        """Buffered MerkleLog must expose pending entries to reads and persist them on close()."""
+        log_path = tmp_path / "test.jsonl"
+        log = MerkleLog(log_path, buffered=True)
+        
+        log.append("test-1", "test", {})
+        log.append("test-2", "test", {})
+        
+        assert log.verify_chain() == (True, None)
+        assert len(log.get_entries()) == 2
+        
+        log.append("test-3", "test", {})
+        log.close()
+        
+        reopened = MerkleLog(log_path)
+        reopened.append("test-4", "test", {})
+        
+        assert len(log_path.read_text().splitlines()) == 4
+        assert reopened.verify_chain() == (True, None)
 
 
 class TestAuditTracerContracts:
     """Contract tests for AuditTracer."""
     
-    def test_audit_tracer_initialization(self):
+    def test_audit_tracer_initialization(self, tmp_path):
         """AuditTracer must initialize with MerkleLog."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            assert isinstance(tracer.log, MerkleLog)
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        assert isinstance(tracer.log, MerkleLog)
     
     def test_event_type_enum(self):
         """EventType must define all required event types."""
@@ -165,75 +218,70 @@ class TestAuditTracerContracts:
         
         assert required_types.issubset(defined_types)
     
-    def test_log_request_signature(self):
+    def test_log_request_signature(self, tmp_path):
         """log_request() must accept request_id, intent, data_sources."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            tracer.log_request(
-                request_id="req-1",
-                intent="Test query",
-                data_sources=["db1", "csv1"],
-            )
-            
-            entries = tracer.log.get_entries(event_type=EventType.REQUEST_SUBMITTED.value)
-            assert len(entries) == 1
-            assert entries[0].data["request_id"] == "req-1"
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        tracer.log_request(
+            request_id="req-1",
+            intent="Test query",
+            data_sources=["db1", "csv1"],
+        )
+        
+        entries = tracer.log.get_entries(event_type=EventType.REQUEST_SUBMITTED.value)
+        assert len(entries) == 1
+        assert entries[0].data["request_id"] == "req-1"
     
-    def test_log_tool_call_signature(self):
+    def test_log_tool_call_signature(self, tmp_path):
         """log_tool_call() must accept call_id, tool_name, arguments."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            tracer.log_tool_call(
-                call_id="call-1",
-                tool_name="sql_runner",
-                arguments={"query": "SELECT * FROM table"},
-            )
-            
-            entries = tracer.log.get_entries(event_type=EventType.TOOL_CALLED.value)
-            assert len(entries) == 1
-            assert entries[0].data["tool_name"] == "sql_runner"
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        tracer.log_tool_call(
+            call_id="call-1",
+            tool_name="sql_runner",
+            arguments={"query": "SELECT * FROM table"},
+        )
+        
+        entries = tracer.log.get_entries(event_type=EventType.TOOL_CALLED.value)
+        assert len(entries) == 1
+        assert entries[0].data["tool_name"] == "sql_runner"
     
-    def test_log_observation_signature(self):
+    def test_log_observation_signature(self, tmp_path):
         """log_observation() must accept observation_id, call_id, status."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            tracer.log_observation(
-                observation_id="obs-1",
-                call_id="call-1",
-                status="success",
-                execution_time_seconds=1.5,
-            )
-            
-            entries = tracer.log.get_entries(event_type=EventType.OBSERVATION_RECORDED.value)
-            assert len(entries) == 1
-            assert entries[0].data["status"] == "success"
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        tracer.log_observation(
+            observation_id="obs-1",
+            call_id="call-1",
+            status="success",
+            execution_time_seconds=1.5,
+        )
+        
+        entries = tracer.log.get_entries(event_type=EventType.OBSERVATION_RECORDED.value)
+        assert len(entries) == 1
+        assert entries[0].data["status"] == "success"
     
-    def test_verify_integrity_delegates(self):
+    def test_verify_integrity_delegates(self, tmp_path):
         """verify_integrity() must delegate to MerkleLog.verify_chain()."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            tracer.log_request("req-1", "Test", [])
-            
-            is_valid, error = tracer.verify_integrity()
-            
-            assert is_valid is True
-            assert error is None
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        tracer.log_request("req-1", "Test", [])
+        
+        is_valid, error = tracer.verify_integrity()
+        
+        assert is_valid is True
+        assert error is None
     
-    def test_get_request_trace(self):
+    def test_get_request_trace(self, tmp_path):
         """get_request_trace() must return all events for request."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tracer = AuditTracer(str(Path(tmpdir) / "test.jsonl"))
-            
-            tracer.log_request("req-1", "Test", [])
-            tracer.log_plan("req-1", "plan-1", 3, 10.0)
-            tracer.log_request("req-2", "Other", [])
-            
-            trace = tracer.get_request_trace("req-1")
-            
-            assert len(trace) == 2
-            for entry in trace:
-                assert entry.entry_id.startswith("req-1")
\ No newline at end of file
+        tracer = AuditTracer(tmp_path / "test.jsonl")
+        
+        tracer.log_request("req-1", "Test", [])
+        tracer.log_plan("req-1", "plan-1", 3, 10.0)
+        tracer.log_request("req-2", "Other", [])
+        
+        trace = tracer.get_request_trace("req-1")
+        
+        assert len(trace) == 2
+        for entry in trace:
+            assert entry.entry_id.startswith("req-1")
\ No newline at end of file
@@ -1,7 +1,11 @@
 """Contract tests for Planner components (T025-T026)."""
 
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
 import pytest
-from unittest.mock import Mock, patch
+
 from lib.agents.data_agent.planner import (
     IntentParser,
     ParsedIntent,
@@ -13,34 +17,47 @@ from lib.agents.data_agent.planner import (
 )
 
 
+# Canned Anthropic responses shared across the IntentParser tests.
+PARSED_INTENT_RESPONSE = SimpleNamespace(
+    content=[SimpleNamespace(text='{"objective": "test", "data_requirements": [], "operations": [{"id": "op1", "description": "query", "dependencies": []}], "deliverables": [], "constraints": []}')]
+)
+PARSED_INTENT_RESPONSE_NO_CONSTRAINTS = SimpleNamespace(
+    content=[SimpleNamespace(text='{"objective": "test", "data_requirements": [], "operations": [{"id": "op1", "description": "query", "dependencies": []}], "deliverables": []}')]
+)
+
+
+@pytest.fixture(scope="class")
+def mock_anthropic():
+    """Patch the Anthropic client once per test class."""
+    with patch('lib.agents.data_agent.planner.intent_parser.Anthropic') as mock_anthropic:
+        yield mock_anthropic
+
+
 class TestIntentParserContract:
     """Validate IntentParser adheres to contract specifications."""
     
-    @patch('lib.agents.data_agent.planner.intent_parser.Anthropic')
     def test_parse_returns_parsed_intent(self, mock_anthropic):
         """IntentParser.parse() must return ParsedIntent with required fields."""
-        mock_response = Mock()
-        mock_response.content = [Mock(text='{"objective": "test", "data_requirements": [], "operations": [{"id": "op1", "description": "query", "dependencies": []}], "deliverables": [], "constraints": []}')]
-        mock_anthropic.return_value.messages.create.return_value = mock_response
+        mock_anthropic.return_value.messages.create.return_value = PARSED_INTENT_RESPONSE
         
         parser = IntentParser(api_key="test-key")
         result = parser.parse("Show me sales", ["sql_runner"], None)
         
         assert isinstance(result, ParsedIntent)
-        assert hasattr(result, 'objective')
-        assert hasattr(result, 'data_requirements')
-        assert hasattr(result, 'operations')
-        assert hasattr(result, 'deliverables')
-        assert hasattr(result, 'constraints')
+        required_fields = {
+            "objective",
+            "data_requirements",
+            "operations",
+            "deliverables",
+            "constraints",
+        }
+        assert required_fields <= vars(result).keys()
         assert len(result.operations) == 1
         assert isinstance(result.operations[0], Operation)
     
-    @patch('lib.agents.data_agent.planner.intent_parser.Anthropic')
     def test_parse_with_schema_info(self, mock_anthropic):
         """IntentParser.parse() must accept optional schema_info parameter."""
-        mock_response = Mock()
-        mock_response.content = [Mock(text='{"objective": "test", "data_requirements": [], "operations": [{"id": "op1", "description": "query", "dependencies": []}], "deliverables": []}')]
-        mock_anthropic.return_value.messages.create.return_value = mock_response
+        mock_anthropic.return_value.messages.create.return_value = PARSED_INTENT_RESPONSE_NO_CONSTRAINTS
         
         parser = IntentParser(api_key="test-key")
         schema = {"fingerprint": "abc123", "columns": ["id", "name"]}
@@ -63,11 +80,8 @@ class TestPlanBuilderContract:
         )
         
         assert isinstance(plan, Plan)
-        assert hasattr(plan, 'plan_id')
-        assert hasattr(plan, 'objective')
-        assert hasattr(plan, 'steps')
-        assert hasattr(plan, 'total_cost')
-        assert hasattr(plan, 'deliverables')
+        required_fields = {"plan_id", "objective", "steps", "total_cost", "deliverables"}
+        assert required_fields <= vars(plan).keys()
         assert len(plan.steps) == 2
     
     def test_plan_steps_have_dependencies(self):
@@ -97,6 +111,28 @@ class TestPlanBuilderContract:
         assert plan.total_cost > 0
         assert plan.total_cost == sum(step.estimated_cost for step in plan.steps)
     
+    def test_plan_step_topo_order_linear_time(self):
+        """DAG validation must stay linear for long plans (no recursion limit)."""
+        builder = PlanBuilder()
+        # Dependents listed before their dependencies: the deepest walk for a DFS
+        operations = [
+            Operation(f"op{i}", f"filter batch {i}", [f"op{i - 1}"] if i else [])
+            for i in reversed(range(10_000))
+        ]
+        
+        start = time.perf_counter()
+        plan = builder.build_plan(
+            objective="Long chain",
+            operations=operations,
+            deliverables=[],
+            constraints=[],
+        )
+        elapsed = time.perf_counter() - start
+        
+        assert len(plan.steps) == 10_000
+        assert plan.steps[0].dependencies == [plan.steps[1].step_id]
+        assert elapsed < 5.0
+    
     def test_dag_validation_rejects_invalid_dependencies(self):
         """PlanBuilder must reject plans with invalid dependencies."""
         builder = PlanBuilder()
@@ -0,0 +1,55 @@
+"""Helpers for inspecting DataAgent JSONL audit logs in integration tests."""
+
+import json
+import mmap
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def iter_audit_entries(path, request_id, event_types=None):
+    """Yield audit log entries for request_id, optionally limited to event_types.
+    
+    MerkleLog has no top-level request_id field, so an entry belongs to the
+    request when its data carries the request_id or its entry_id starts with
+    it, the same prefix AuditTracer.get_request_trace() uses.
+    
+    The log is memory-mapped and searched for request_id directly, so only
+    the lines that mention it are copied out and decoded (with orjson when
+    it is installed); the rest of the file is never split into lines.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    needle = request_id.encode()
+    
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = mm.find(needle)
+            while pos != -1:
+                start = mm.rfind(b"\n", 0, pos) + 1
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = len(mm)
+                entry = loads(mm[start:end])
+                if _belongs_to(entry, request_id) and (
+                    event_types is None or entry["event_type"] in event_types
+                ):
+                    yield entry
+                pos = mm.find(needle, end)
+
+
+def _belongs_to(entry, request_id):
+    """Return True if the MerkleLog entry was logged for request_id."""
+    data = entry.get("data")
+    if isinstance(data, dict) and data.get("request_id") == request_id:
+        return True
+    return entry["entry_id"].startswith(request_id)
+
+
+def load_audit_entries(path, request_id, event_types=None):
+    """Return the audit log entries for request_id as a list."""
+    return list(iter_audit_entries(path, request_id, event_types))
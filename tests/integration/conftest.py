@@ -0,0 +1,99 @@
+"""Shared fixtures for integration tests."""
+
+import hashlib
+import os
+
+import numpy as np
+import pytest
+from _pytest.mark.expression import Expression
+
+
+class HashEmbedder:
+    """Deterministic bag-of-words stand-in for a sentence-transformer.
+    
+    Each whitespace token is hashed into one of ``dim`` buckets and the
+    counts are L2-normalized, so texts sharing words score higher under
+    cosine similarity. Good enough for tests that only check ranking and
+    needs no model download.
+    """
+    
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+    
+    def encode(self, sentences, **kwargs):
+        """Embed a string to a (dim,) vector or a list of strings to (N, dim)."""
+        if isinstance(sentences, str):
+            return self._embed(sentences)
+        return np.stack([self._embed(text) for text in sentences])
+    
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in text.lower().split():
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            vector[int.from_bytes(digest, "little") % self.dim] += 1.0
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_heavy_imports():
+    """Pay matplotlib's one-off import and font-cache costs before the first test is timed.
+    
+    sentence_transformers is deliberately not imported here: most runs never
+    embed anything, and shared_embedder imports it on first use.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    
+    fig = plt.figure()
+    fig.text(0.5, 0.5, "warm-up")
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+@pytest.fixture(scope="session")
+def hash_embedder():
+    """Cheap deterministic embedder for tests that only assert ordering."""
+    return HashEmbedder()
+
+
+@pytest.fixture(scope="session")
+def shared_embedder():
+    """Load the sentence-transformer model once for every RecipeStore in the session.
+    
+    Set RECIPE_EMBED=hash to substitute HashEmbedder and skip the download.
+    """
+    if os.environ.get("RECIPE_EMBED") == "hash":
+        return HashEmbedder()
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    return sentence_transformers.SentenceTransformer("all-MiniLM-L6-v2")
+
+
+# Modules whose tests carry only the integration marker. When the -m
+# expression deselects such tests (as the pytest.ini default does) they are
+# not imported at all.
+INTEGRATION_ONLY_MODULES = {"test_memory_integration.py", "test_recipe_reuse.py"}
+
+
+def _deselects_integration_only(markexpr):
+    """Return True if markexpr rejects a test whose only marker is integration."""
+    if not markexpr:
+        return False
+    try:
+        expression = Expression.compile(markexpr)
+    except Exception:
+        # ParseError on older pytest, SyntaxError on newer; either way leave
+        # reporting the malformed expression to pytest's own -m handling
+        return False
+    return not expression.evaluate(lambda name, **kwargs: name == "integration")
+
+
+def pytest_ignore_collect(collection_path, config):
+    """Skip importing integration-only modules that the -m expression excludes."""
+    if collection_path.name in INTEGRATION_ONLY_MODULES and _deselects_integration_only(
+        config.getoption("markexpr")
+    ):
+        return True
+    return None
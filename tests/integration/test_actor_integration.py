@@ -11,12 +11,30 @@ from lib.agents.data_agent.actor import Actor, ExecutionStatus
 from lib.agents.data_agent.planner import PlanBuilder, ToolType, PlanStep
 
 
+# Frames shared across tests; none of the tools or tests mutate them in place.
+EMPTY_DF = pd.DataFrame()
+SALES_DF = pd.DataFrame({"id": [1, 2], "value": [10, 20]})
+REGION_REVENUE_DF = pd.DataFrame({"region": ["A", "B", "C"], "revenue": [100, 200, 150]})
+GROUNDING_DF = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+
+
+@pytest.fixture(scope="class")
+def grounding_actor():
+    """One Actor for the argument-extraction cases; ground_step never calls the tools."""
+    tool_registry = {
+        "sql_runner": Mock(return_value=EMPTY_DF),
+        "df_operations": Mock(return_value=EMPTY_DF),
+        "plotter": Mock(return_value={"chart_path": "/tmp/chart.png"}),
+    }
+    return Actor(tool_registry=tool_registry, schema_context={"database": "test_db"})
+
+
 class TestActorPlanExecution:
     """Integration tests for Actor executing complete plans."""
     
     def test_single_step_execution_success(self):
         """Actor must successfully execute single-step plan."""
-        mock_sql = Mock(return_value=pd.DataFrame({"id": [1, 2], "value": [10, 20]}))
+        mock_sql = Mock(return_value=SALES_DF)
         tool_registry = {"sql_runner": mock_sql}
         actor = Actor(tool_registry=tool_registry)
         
@@ -37,7 +55,7 @@ class TestActorPlanExecution:
     
     def test_multi_step_sequential_execution(self):
         """Actor must execute multi-step plan with sequential dependencies."""
-        query_result = pd.DataFrame({"region": ["A", "B", "C"], "revenue": [100, 200, 150]})
+        query_result = REGION_REVENUE_DF
         mock_sql = Mock(return_value=query_result)
         
         def mock_df_op(dataframe=None, operation=None, operation_type=None, **kwargs):
@@ -82,22 +100,76 @@ class TestActorPlanExecution:
             ),
         ]
         
-        execution_context = {}
-        observations = []
+        execution_context = {"dataframe": query_result}
         
-        for step in steps:
-            if step.step_id == "step-2":
-                execution_context["dataframe"] = query_result
-            elif step.step_id == "step-3":
-                execution_context["dataframe"] = query_result
-            
-            obs = actor.execute_step(step, execution_context)
-            observations.append(obs)
+        observations = actor.execute_plan(steps, execution_context)
         
+        assert [obs.step_id for obs in observations] == ["step-1", "step-2", "step-3"]
         assert all(obs.is_success() for obs in observations)
         assert len(actor.execution_history) == 3
         assert observations[2].result["chart_path"].endswith(".png")
     
+    def test_execute_plan_skips_dependents_of_failed_step(self):
+        """execute_plan must run independent steps and skip those after a failure."""
+        tool_registry = {
+            "sql_runner": Mock(side_effect=ValueError("Invalid query")),
+            "plotter": Mock(return_value={"chart_path": "/tmp/chart.png"}),
+        }
+        actor = Actor(tool_registry=tool_registry)
+        
+        steps = [
+            PlanStep("s1", "query", ToolType.SQL_RUNNER, [], 2.0, []),
+            PlanStep("s2", "plot query result", ToolType.PLOTTER, ["s1"], 1.5, []),
+            PlanStep("s3", "plot summary", ToolType.PLOTTER, [], 1.5, []),
+        ]
+        
+        observations = actor.execute_plan(steps, {"dataframe": SALES_DF})
+        
+        assert [obs.status for obs in observations] == [
+            ExecutionStatus.FAILURE,
+            ExecutionStatus.FAILURE,
+            ExecutionStatus.SUCCESS,
+        ]
+        assert "dependency failed: s1" in observations[1].error_message
+        assert tool_registry["plotter"].call_count == 1
+    
+    def test_execute_plan_isolates_and_merges_independent_step_contexts(self):
+        """Independent steps get their own context copy; results merge after the wave."""
+        tool_registry = {
+            "sql_runner": Mock(return_value=SALES_DF),
+            "plotter": Mock(return_value={"chart_path": "/tmp/chart.png"}),
+        }
+        actor = Actor(tool_registry=tool_registry)
+        seen_contexts = []
+        ground_step = actor.ground_step
+        
+        def recording_ground_step(step, execution_context=None):
+            seen_contexts.append((step.step_id, execution_context))
+            execution_context[f"written_by_{step.step_id}"] = True
+            return ground_step(step, execution_context)
+        
+        actor.ground_step = recording_ground_step
+        
+        steps = [
+            PlanStep("s1", "query", ToolType.SQL_RUNNER, [], 2.0, []),
+            PlanStep("s2", "plot summary", ToolType.PLOTTER, [], 1.5, []),
+            PlanStep("s3", "plot query result", ToolType.PLOTTER, ["s1", "s2"], 1.5, []),
+        ]
+        execution_context = {"dataframe": SALES_DF}
+        
+        observations = actor.execute_plan(steps, execution_context)
+        
+        assert all(obs.is_success() for obs in observations)
+        contexts = dict(seen_contexts)
+        assert contexts["s1"] is not contexts["s2"]
+        assert "written_by_s2" not in contexts["s1"]
+        assert "written_by_s1" not in contexts["s2"]
+        assert not any(key.startswith("written_by_") for key in execution_context)
+        assert execution_context["step_s1_result"] is SALES_DF
+        assert execution_context["step_s2_result"] == {"chart_path": "/tmp/chart.png"}
+        assert {"step_s1_result", "step_s2_result"} <= contexts["s3"].keys()
+        assert [obs.step_id for obs in actor.execution_history] == ["s1", "s2", "s3"]
+    
     def test_self_repair_success_after_retry(self):
         """Actor must successfully recover from transient failures."""
         call_count = 0
@@ -151,7 +223,7 @@ class TestActorPlanExecution:
     
     def test_invariant_validation_enforcement(self):
         """Actor must enforce invariants before execution."""
-        mock_tool = Mock(return_value=pd.DataFrame())
+        mock_tool = Mock(return_value=EMPTY_DF)
         tool_registry = {"df_operations": mock_tool}
         actor = Actor(tool_registry=tool_registry)
         
@@ -206,74 +278,62 @@ class TestActorPlanExecution:
         assert 0.0 <= summary["success_rate"] <= 1.0
         assert summary["avg_retries"] >= 0.0
     
-    def test_tool_argument_extraction_sql(self):
-        """Actor must correctly extract SQL runner arguments."""
-        mock_sql = Mock(return_value=pd.DataFrame())
-        tool_registry = {"sql_runner": mock_sql}
-        schema_context = {"database": "test_db"}
-        actor = Actor(tool_registry=tool_registry, schema_context=schema_context)
-        
-        step = PlanStep(
-            step_id="step-1",
-            operation="SELECT * FROM sales WHERE region = 'US'",
-            tool=ToolType.SQL_RUNNER,
-            dependencies=[],
-            estimated_cost=2.0,
-            invariants=["row_limit=5000"],
-        )
-        
-        tool_call = actor.ground_step(step)
-        
-        assert "query" in tool_call.arguments
-        assert tool_call.arguments["query"] == step.operation
-        assert "database" in tool_call.arguments
-        assert tool_call.arguments["database"] == "test_db"
-        assert tool_call.arguments.get("limit") == 5000
-    
-    def test_tool_argument_extraction_dataframe_ops(self):
-        """Actor must correctly extract DataFrame operations arguments."""
-        mock_df_op = Mock(return_value=pd.DataFrame())
-        tool_registry = {"df_operations": mock_df_op}
-        actor = Actor(tool_registry=tool_registry)
-        
-        df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
-        context = {"dataframe": df}
+    @pytest.mark.parametrize(
+        "tool, operation, invariants, expected_keys, expected_values",
+        [
+            pytest.param(
+                ToolType.SQL_RUNNER,
+                "SELECT * FROM sales WHERE region = 'US'",
+                ["row_limit=5000"],
+                {"query", "database", "limit"},
+                {
+                    "query": "SELECT * FROM sales WHERE region = 'US'",
+                    "database": "test_db",
+                    "limit": 5000,
+                },
+                id="sql",
+            ),
+            pytest.param(
+                ToolType.DF_OPERATIONS,
+                "Filter rows where revenue > 1000",
+                [],
+                {"operation", "dataframe", "operation_type"},
+                {"operation_type": "filter"},
+                id="dataframe_ops",
+            ),
+            pytest.param(
+                ToolType.PLOTTER,
+                "Create bar chart of revenue by region",
+                [],
+                {"title", "data", "chart_type"},
+                {"chart_type": "bar"},
+                id="plotter",
+            ),
+        ],
+    )
+    def test_tool_argument_extraction(
+        self,
+        grounding_actor,
+        tool,
+        operation,
+        invariants,
+        expected_keys,
+        expected_values,
+    ):
+        """Actor must correctly extract arguments for each tool type."""
+        context = {"dataframe": GROUNDING_DF}
         
         step = PlanStep(
             step_id="step-1",
-            operation="Filter rows where revenue > 1000",
-            tool=ToolType.DF_OPERATIONS,
+            operation=operation,
+            tool=tool,
             dependencies=[],
             estimated_cost=1.0,
-            invariants=[],
-        )
-        
-        tool_call = actor.ground_step(step, context)
-        
-        assert "operation" in tool_call.arguments
-        assert "dataframe" in tool_call.arguments
-        assert tool_call.arguments["operation_type"] == "filter"
-    
-    def test_tool_argument_extraction_plotter(self):
-        """Actor must correctly extract plotter arguments."""
-        mock_plotter = Mock(return_value={"chart_path": "/tmp/chart.png"})
-        tool_registry = {"plotter": mock_plotter}
-        actor = Actor(tool_registry=tool_registry)
-        
-        df = pd.DataFrame({"x": [1, 2], "y": [3, 4]})
-        context = {"dataframe": df}
-        
-        step = PlanStep(
-            step_id="step-1",
-            operation="Create bar chart of revenue by region",
-            tool=ToolType.PLOTTER,
-            dependencies=[],
-            estimated_cost=1.5,
-            invariants=[],
+            invariants=invariants,
         )
         
-        tool_call = actor.ground_step(step, context)
+        tool_call = grounding_actor.ground_step(step, context)
         
-        assert "title" in tool_call.arguments
-        assert "data" in tool_call.arguments
-        assert tool_call.arguments["chart_type"] == "bar"
\ No newline at end of file
+        assert expected_keys <= tool_call.arguments.keys()
+        for key, value in expected_values.items():
+            assert tool_call.arguments[key] == value
@@ -3,17 +3,22 @@
 Tests the integration of tools and safety layer without full orchestrator.
 """
 
-import tempfile
+import hashlib
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import pytest
 from lib.agents.data_agent.tools import SQLRunner, DataFrameOperations, Plotter, DataProfiler
 from lib.agents.data_agent.safety import PolicyEnforcer, SandboxExecutor, ResourceQuota
 
 
-@pytest.fixture
+# Screen resolution is plenty for asserting that a chart artifact was written.
+PLOT_DPI = 72
+
+
+@pytest.fixture(scope="module")
 def sample_dataframe():
-    """Create sample DataFrame for testing."""
+    """Create sample DataFrame once per module; tests that mutate it must .copy() first."""
     return pd.DataFrame({
         "region": ["A", "A", "B", "B", "C"],
         "sales": [100, 200, 150, 300, 250],
@@ -23,12 +28,12 @@ def sample_dataframe():
 
 
 @pytest.fixture
-def artifacts_dir():
-    """Create temporary artifacts directory."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def artifacts_dir(tmp_path_factory):
+    """Create a per-test artifacts directory, unique across xdist workers."""
+    return tmp_path_factory.mktemp("artifacts", numbered=True)
 
 
+@pytest.mark.parallel
 class TestDataAgentDogfood:
     """Integration test demonstrating DataAgent components working together."""
     
@@ -47,8 +52,10 @@ class TestDataAgentDogfood:
             "UPDATE users SET password = 'pwned'",
         ]
         
-        for query in dangerous_queries:
-            result = enforcer.validate_query(query)
+        results = enforcer.validate_queries(dangerous_queries)
+        
+        assert len(results) == len(dangerous_queries)
+        for query, result in zip(dangerous_queries, results):
             assert not result.allowed, f"Dangerous query should be blocked: {query}"
             assert len(result.violations) > 0
             assert result.severity == "critical"
@@ -91,7 +98,7 @@ class TestDataAgentDogfood:
     
     def test_plotter_generates_artifacts(self, sample_dataframe, artifacts_dir):
         """Test: Plotter generates chart artifacts with metadata."""
-        plotter = Plotter(artifacts_dir)
+        plotter = Plotter(artifacts_dir, dpi=PLOT_DPI)
         
         result = plotter.bar_chart(
             sample_dataframe,
@@ -105,6 +112,7 @@ class TestDataAgentDogfood:
         assert Path(result.file_path).exists()
         assert result.content_hash is not None
         assert len(result.content_hash) == 64
+        assert result.content_hash == hashlib.sha256(Path(result.file_path).read_bytes()).hexdigest()
         assert result.plot_type == "bar"
         assert result.size_bytes > 0
     
@@ -124,20 +132,20 @@ class TestDataAgentDogfood:
             assert col_profile.null_count == 0
             assert col_profile.unique_count > 0
     
-    @pytest.mark.skip(reason="Signal-based timeout unreliable on macOS; threading alternative needed")
     def test_sandbox_enforces_timeout(self):
         """Test: SandboxExecutor enforces timeout limits."""
         import time
         
-        sandbox = SandboxExecutor(ResourceQuota(max_execution_seconds=0.5))
+        sandbox = SandboxExecutor(ResourceQuota(max_execution_seconds=0.1))
         
         def slow_function():
-            time.sleep(2)
+            time.sleep(0.5)
             return "Should timeout"
         
         result = sandbox.execute_in_sandbox(slow_function)
         
         assert not result.success
+        assert result.execution_time_seconds < 0.5
         assert "timeout" in result.error.lower()
         assert len(result.violations) > 0
     
@@ -146,8 +154,8 @@ class TestDataAgentDogfood:
         sandbox = SandboxExecutor()
         
         def memory_intensive():
-            data = [i**2 for i in range(100000)]
-            return len(data)
+            data = np.arange(100000, dtype=np.int64) ** 2
+            return int(data.size)
         
         result = sandbox.execute_in_sandbox(memory_intensive)
         
@@ -161,7 +169,7 @@ class TestDataAgentDogfood:
         enforcer = PolicyEnforcer()
         sandbox = SandboxExecutor()
         df_ops = DataFrameOperations()
-        plotter = Plotter(artifacts_dir)
+        plotter = Plotter(artifacts_dir, dpi=PLOT_DPI)
         profiler = DataProfiler()
         
         query = "SELECT * FROM sales WHERE region IN ('A', 'B', 'C')"
@@ -3,12 +3,13 @@
 Tests recipe storage and retrieval end-to-end workflows.
 
 NOTE: These tests require sentence-transformers model downloads and may have network dependencies.
+Set RECIPE_EMBED=hash to run them against a deterministic hash embedder instead.
 Run with: pytest -m integration
 Skip with: pytest -m "not integration"
 """
 
-import tempfile
-from pathlib import Path
+import sqlite3
+from unittest.mock import Mock
 
 import pandas as pd
 import pytest
@@ -21,17 +22,42 @@ from lib.agents.data_agent.memory import (
 
 pytestmark = pytest.mark.integration
 
+# (schema_fingerprint, intent_template) pairs preloaded into seeded_store
+SEED_RECIPES = [
+    ("schema_a", "Intent 1"),
+    ("schema_a", "Intent 2"),
+    ("schema_b", "Intent 3"),
+]
+
+
+@pytest.fixture(scope="class")
+def seeded_store(shared_embedder):
+    """In-memory store with SEED_RECIPES, built once per class; tests must not mutate it."""
+    store = RecipeStore(db_path=":memory:", embedder=shared_embedder)
+    store.save_recipes_bulk([
+        {
+            "schema_fingerprint": schema_fp,
+            "intent_template": intent_template,
+            "plan_structure": {},
+            "tool_argument_templates": [],
+        }
+        for schema_fp, intent_template in SEED_RECIPES
+    ])
+    return store
+
 
 class TestMemoryLayerIntegration:
     """Integration tests for complete memory workflows."""
     
     @pytest.fixture
-    def temp_store(self):
-        """Create temporary recipe store for testing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = Path(tmpdir) / "test_recipes.db"
-            store = RecipeStore(db_path=str(db_path))
-            yield store
+    def temp_store(self, shared_embedder):
+        """Create in-memory recipe store; the embedding model is shared."""
+        return RecipeStore(db_path=":memory:", embedder=shared_embedder)
+    
+    @pytest.fixture
+    def hash_store(self, hash_embedder):
+        """Recipe store backed by the hash embedder, for ranking-only checks."""
+        return RecipeStore(db_path=":memory:", embedder=hash_embedder)
     
     @pytest.fixture
     def sample_dataframe(self):
@@ -96,32 +122,27 @@ class TestMemoryLayerIntegration:
     
     def test_recipe_retrieval_with_multiple_candidates(
         self,
-        temp_store,
+        hash_store,
         sample_dataframe,
     ):
         """Semantic ranking works when multiple recipes match schema."""
         schema_fp = compute_schema_fingerprint(sample_dataframe)
         
-        temp_store.save_recipe(
-            schema_fp,
-            "Analyze quarterly sales revenue trends",
-            {"subtasks": []},
-            [],
-        )
-        temp_store.save_recipe(
-            schema_fp,
-            "Show regional distribution of orders",
-            {"subtasks": []},
-            [],
-        )
-        temp_store.save_recipe(
-            schema_fp,
-            "Calculate total revenue by product category",
-            {"subtasks": []},
-            [],
-        )
+        hash_store.save_recipes_bulk([
+            {
+                "schema_fingerprint": schema_fp,
+                "intent_template": intent_template,
+                "plan_structure": {"subtasks": []},
+                "tool_argument_templates": [],
+            }
+            for intent_template in [
+                "Analyze quarterly sales revenue trends",
+                "Show regional distribution of orders",
+                "Calculate total revenue by product category",
+            ]
+        ])
         
-        results = temp_store.retrieve_recipes(
+        results = hash_store.retrieve_recipes(
             schema_fp,
             "Analyze sales revenue patterns",
             top_k=3,
@@ -131,6 +152,24 @@ class TestMemoryLayerIntegration:
         
         assert "sales" in results[0].intent_template.lower() or "revenue" in results[0].intent_template.lower()
     
+    def test_tied_scores_keep_insertion_order(self, hash_store):
+        """Recipes with equal scores rank in the order they were saved, at the top-K cutoff too."""
+        best, tied, worst = "alpha beta", "alpha gamma", "delta epsilon"
+        intents = [tied, worst, worst, worst, worst, worst, worst, best, tied, best]
+        recipe_ids = hash_store.save_recipes_bulk([
+            {
+                "schema_fingerprint": "schema_ties",
+                "intent_template": intent_template,
+                "plan_structure": {},
+                "tool_argument_templates": [],
+            }
+            for intent_template in intents
+        ])
+        
+        results = hash_store.retrieve_recipes("schema_ties", best, top_k=6)
+        
+        assert [r.recipe_id for r in results] == [recipe_ids[i] for i in (7, 9, 0, 8, 1, 2)]
+    
     def test_schema_fingerprint_consistency_across_dataframes(self):
         """Same schema produces same fingerprint regardless of data."""
         df1 = pd.DataFrame({
@@ -171,16 +210,9 @@ class TestMemoryLayerIntegration:
         assert updated.success_count == 3
         assert updated.last_used_at > original.last_used_at
     
-    def test_no_recipes_for_unmatched_schema(self, temp_store):
+    def test_no_recipes_for_unmatched_schema(self, seeded_store):
         """Retrieval returns empty list when no recipes match schema."""
-        temp_store.save_recipe(
-            "schema_abc",
-            "Test recipe",
-            {},
-            [],
-        )
-        
-        results = temp_store.retrieve_recipes(
+        results = seeded_store.retrieve_recipes(
             "schema_xyz",
             "Any intent",
             top_k=5,
@@ -188,15 +220,26 @@ class TestMemoryLayerIntegration:
         
         assert len(results) == 0
     
+    def test_list_recipes_filters_by_schema(self, seeded_store):
+        """Listing by schema returns only that schema's recipes."""
+        recipes = seeded_store.list_recipes(schema_fingerprint="schema_a")
+        
+        assert sorted(r.intent_template for r in recipes) == ["Intent 1", "Intent 2"]
+    
     def test_recipe_store_stats_accuracy(self, temp_store):
         """Store statistics reflect actual state."""
-        temp_store.save_recipe("schema_a", "Intent 1", {}, [])
-        temp_store.save_recipe("schema_a", "Intent 2", {}, [])
-        temp_store.save_recipe("schema_b", "Intent 3", {}, [])
+        recipe_ids = temp_store.save_recipes_bulk([
+            {
+                "schema_fingerprint": schema_fp,
+                "intent_template": intent_template,
+                "plan_structure": {},
+                "tool_argument_templates": [],
+            }
+            for schema_fp, intent_template in SEED_RECIPES
+        ])
         
-        recipes = temp_store.list_recipes()
-        temp_store.update_success_count(recipes[0].recipe_id)
-        temp_store.update_success_count(recipes[1].recipe_id)
+        assert len(set(recipe_ids)) == 3
+        temp_store.update_success_counts(recipe_ids[:2])
         
         stats = temp_store.get_stats()
         
@@ -234,24 +277,60 @@ class TestMemoryLayerIntegration:
         assert fingerprints[0] != fingerprints[1], "df[0] and df[1] have different schemas"
         assert all(len(fp) == 64 for fp in fingerprints), "All fingerprints are SHA256"
     
-    def test_recipe_persistence_across_store_instances(self):
+    def test_recipe_persistence_across_store_instances(self, tmp_path, shared_embedder):
         """Recipes persist when store is reopened."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = Path(tmpdir) / "persistent_test.db"
-            
-            store1 = RecipeStore(db_path=str(db_path))
-            recipe_id = store1.save_recipe(
-                "persistent_schema",
-                "Persistent recipe",
-                {"key": "value"},
-                [],
-            )
-            
-            del store1
-            
-            store2 = RecipeStore(db_path=str(db_path))
-            retrieved = store2.get_recipe(recipe_id)
-            
-            assert retrieved is not None
-            assert retrieved.recipe_id == recipe_id
-            assert retrieved.intent_template == "Persistent recipe"
\ No newline at end of file
+        db_path = tmp_path / "persistent_test.db"
+        
+        store1 = RecipeStore(db_path=str(db_path), embedder=shared_embedder)
+        recipe_id = store1.save_recipe(
+            "persistent_schema",
+            "Persistent recipe",
+            {"key": "value"},
+            [],
+        )
+        
+        del store1
+        
+        store2 = RecipeStore(db_path=str(db_path), embedder=shared_embedder)
+        retrieved = store2.get_recipe(recipe_id)
+        
+        assert retrieved is not None
+        assert retrieved.recipe_id == recipe_id
+        assert retrieved.intent_template == "Persistent recipe"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["persistent_test.db"]
+    
+    def test_close_releases_in_memory_database(self, hash_embedder):
+        """Closing an in-memory store drops the connection keeping it alive."""
+        store = RecipeStore(db_path=":memory:", embedder=hash_embedder)
+        keepalive = store._keepalive_conn
+        
+        store.close()
+        store.close()
+        
+        assert store._keepalive_conn is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            keepalive.execute("SELECT 1")
+    
+    def test_in_memory_stores_are_isolated(self, hash_embedder):
+        """Each ":memory:" store keeps its recipes to itself across calls."""
+        store1 = RecipeStore(db_path=":memory:", embedder=hash_embedder)
+        store2 = RecipeStore(db_path=":memory:", embedder=hash_embedder)
+        
+        recipe_id = store1.save_recipe("schema_mem", "In-memory recipe", {}, [])
+        
+        assert store1.get_recipe(recipe_id) is not None
+        assert store2.get_recipe(recipe_id) is None
+        assert store2.get_stats()["total_recipes"] == 0
+    
+    def test_repeated_intent_is_embedded_once(self, hash_embedder):
+        """Retrieving with the same intent reuses its cached embedding."""
+        embedder = Mock(wraps=hash_embedder)
+        store = RecipeStore(db_path=":memory:", embedder=embedder)
+        store.save_recipe("schema_cache", "Analyze sales trends", {}, [])
+        embedder.encode.reset_mock()
+        
+        first = store.retrieve_recipes("schema_cache", "Show sales trends", top_k=1)
+        second = store.retrieve_recipes("schema_cache", "Show sales trends", top_k=1)
+        
+        assert [r.recipe_id for r in first] == [r.recipe_id for r in second]
+        assert embedder.encode.call_count == 1
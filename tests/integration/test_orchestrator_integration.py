@@ -1,221 +1,248 @@
 """Integration tests for DataAgent orchestrator."""
 
+from collections import Counter
+
 import pytest
-from unittest.mock import Mock, MagicMock
 import pandas as pd
-import tempfile
-from pathlib import Path
 
 from lib.agents.data_agent.agent import DataAgent, AnalysisRequest, AnalysisStatus
 
 
+# Tool outputs shared by every test; DataAgent only reads them, never mutates.
+ID_VALUE_DF = pd.DataFrame({"id": [1, 2], "value": [10, 20]})
+SINGLE_ROW_DF = pd.DataFrame({"id": [1], "value": [10]})
+X_DF = pd.DataFrame({"x": [1, 2, 3]})
+CHART_RESULT = {"chart_path": "/tmp/chart.png"}
+
+@pytest.fixture
+def agent_paths(tmp_path):
+    """In-memory recipe store and an audit log path under the test's tmp_path."""
+    return ":memory:", str(tmp_path / "audit.jsonl")
+
+
+def raising_tool(exc_type, message):
+    """Return a tool that raises a fresh exc_type(message) on every call."""
+    def tool(**_):
+        raise exc_type(message)
+    return tool
+
+
+# Tool registries per scenario. Nothing asserts on tool calls, so plain
+# callables stand in for Mocks and each registry is built once per module.
+SUCCESS_TOOL_REGISTRY = {
+    "sql_runner": lambda **_: ID_VALUE_DF,
+    "df_operations": lambda **_: ID_VALUE_DF,
+    "plotter": lambda **_: CHART_RESULT,
+}
+DF_OPS_FAILURE_TOOL_REGISTRY = {
+    "sql_runner": lambda **_: SINGLE_ROW_DF,
+    "df_operations": raising_tool(ValueError, "Invalid operation"),
+    "plotter": lambda **_: CHART_RESULT,
+}
+SQL_FAILURE_TOOL_REGISTRY = {"sql_runner": raising_tool(RuntimeError, "Database connection lost")}
+SHARED_TOOL_REGISTRY = {"sql_runner": lambda **_: X_DF}
+
+
+@pytest.fixture(scope="class")
+def shared_agent(tmp_path_factory):
+    """DataAgent built once per class; tests isolate state by request_id."""
+    agent_dir = tmp_path_factory.mktemp("shared_agent")
+    agent = DataAgent(
+        tool_registry=SHARED_TOOL_REGISTRY,
+        recipe_store_path=":memory:",
+        audit_log_path=str(agent_dir / "audit.jsonl"),
+        audit_buffered=True,
+    )
+    yield agent
+    agent.close()
+
+
+@pytest.mark.parallel
 class TestDataAgentOrchestration:
     """Integration tests for end-to-end DataAgent workflows."""
     
-    def test_successful_analysis_workflow(self):
+    def test_successful_analysis_workflow(self, agent_paths):
         """DataAgent must complete full analysis workflow successfully."""
-        # Mock tools
-        mock_sql = Mock(return_value=pd.DataFrame({"id": [1, 2], "value": [10, 20]}))
-        mock_df_ops = Mock(return_value=pd.DataFrame({"id": [1, 2], "value": [10, 20]}))
-        mock_plotter = Mock(return_value={"chart_path": "/tmp/chart.png"})
-        
-        tool_registry = {
-            "sql_runner": mock_sql,
-            "df_operations": mock_df_ops,
-            "plotter": mock_plotter,
-        }
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-1",
-                intent="Analyze sales data and create visualization",
-                data_sources=["sales_db"],
-                deliverables=["table", "chart"],
-            )
-            
-            response = agent.analyze(request)
-            
-            assert response.status == AnalysisStatus.SUCCESS
-            assert response.request_id == "test-req-1"
-            assert len(response.artifacts) > 0
-            assert response.plan_ref is not None
-            assert response.metrics["total_steps"] > 0
-            assert response.metrics["failed_steps"] == 0
+        recipes_db, audit_log = agent_paths
+        agent = DataAgent(
+            tool_registry=SUCCESS_TOOL_REGISTRY,
+            recipe_store_path=recipes_db,
+            audit_log_path=audit_log,
+        )
+        
+        request = AnalysisRequest(
+            request_id="test-req-1",
+            intent="Analyze sales data and create visualization",
+            data_sources=["sales_db"],
+            deliverables=["table", "chart"],
+        )
+        
+        response = agent.analyze(request)
+        
+        assert response.status == AnalysisStatus.SUCCESS
+        assert response.request_id == "test-req-1"
+        assert len(response.artifacts) > 0
+        assert response.plan_ref is not None
+        assert response.metrics["total_steps"] > 0
+        assert response.metrics["failed_steps"] == 0
     
-    def test_partial_success_with_failed_steps(self):
+    def test_partial_success_with_failed_steps(self, agent_paths):
         """DataAgent must handle partial success when some steps fail."""
-        # Mock tools - second tool fails
-        mock_sql = Mock(return_value=pd.DataFrame({"id": [1], "value": [10]}))
-        mock_df_ops = Mock(side_effect=ValueError("Invalid operation"))
-        mock_plotter = Mock(return_value={"chart_path": "/tmp/chart.png"})
-        
-        tool_registry = {
-            "sql_runner": mock_sql,
-            "df_operations": mock_df_ops,
-            "plotter": mock_plotter,
-        }
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-2",
-                intent="Process data with transformations",
-                data_sources=["data_db"],
-            )
-            
-            response = agent.analyze(request)
-            
-            # Should be partial success (some steps worked)
-            assert response.status in [AnalysisStatus.PARTIAL, AnalysisStatus.FAILURE]
-            assert response.error_message is not None
-            assert "Invalid operation" in response.error_message or response.metrics["failed_steps"] > 0
+        # Second tool fails
+        recipes_db, audit_log = agent_paths
+        agent = DataAgent(
+            tool_registry=DF_OPS_FAILURE_TOOL_REGISTRY,
+            recipe_store_path=recipes_db,
+            audit_log_path=audit_log,
+        )
+        
+        request = AnalysisRequest(
+            request_id="test-req-2",
+            intent="Process data with transformations",
+            data_sources=["data_db"],
+        )
+        
+        response = agent.analyze(request)
+        
+        # Should be partial success (some steps worked)
+        assert response.status in [AnalysisStatus.PARTIAL, AnalysisStatus.FAILURE]
+        assert response.error_message is not None
+        assert "Invalid operation" in response.error_message or response.metrics["failed_steps"] > 0
     
-    def test_progress_callback_invoked(self):
+    def test_progress_callback_invoked(self, shared_agent):
         """DataAgent must invoke progress callback during analysis."""
-        mock_tool = Mock(return_value=pd.DataFrame({"x": [1]}))
-        tool_registry = {"sql_runner": mock_tool}
-        
         progress_calls = []
         
         def progress_callback(message: str, progress: float):
             progress_calls.append((message, progress))
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            agent.set_progress_callback(progress_callback)
-            
-            request = AnalysisRequest(
-                request_id="test-req-3",
-                intent="Quick query",
-                data_sources=["db"],
-            )
-            
-            agent.analyze(request)
-            
-            assert len(progress_calls) > 0
-            # First call should be 0.0, last should be 1.0
-            assert progress_calls[0][1] == 0.0
-            assert progress_calls[-1][1] == 1.0
+        shared_agent.set_progress_callback(progress_callback)
+        
+        request = AnalysisRequest(
+            request_id="test-req-3",
+            intent="Quick query",
+            data_sources=["db"],
+        )
+        
+        shared_agent.analyze(request)
+        shared_agent.set_progress_callback(None)
+        
+        assert len(progress_calls) > 0
+        # First call should be 0.0, last should be 1.0
+        assert progress_calls[0][1] == 0.0
+        assert progress_calls[-1][1] == 1.0
     
-    def test_audit_trail_completeness(self):
+    @pytest.mark.parametrize("granularity", [0.25, 0.5, 2.0])
+    def test_progress_callback_granularity(self, shared_agent, granularity):
+        """DataAgent must drop intermediate updates finer than the requested granularity."""
+        progress_calls = []
+        
+        shared_agent.set_progress_callback(
+            lambda message, progress: progress_calls.append(progress),
+            granularity=granularity,
+        )
+        request = AnalysisRequest(
+            request_id="test-req-3b",
+            intent="Quick query",
+            data_sources=["db"],
+        )
+        shared_agent.analyze(request)
+        shared_agent.set_progress_callback(None)
+        
+        # The endpoints are always delivered; every update in between is at
+        # least granularity past the one reported before it
+        assert progress_calls[0] == 0.0
+        assert progress_calls[-1] == 1.0
+        intermediate = progress_calls[1:-1]
+        assert all(
+            later - earlier >= granularity
+            for earlier, later in zip(progress_calls, intermediate)
+        )
+    
+    def test_audit_trail_completeness(self, shared_agent):
         """DataAgent must log all events to audit trail."""
-        mock_tool = Mock(return_value=pd.DataFrame({"x": [1]}))
-        tool_registry = {"sql_runner": mock_tool}
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-4",
-                intent="Test audit trail",
-                data_sources=["db"],
-            )
-            
-            agent.analyze(request)
-            
-            # Verify audit log has entries
-            trace = agent.get_request_trace("test-req-4")
-            
-            assert len(trace) > 0
-            
-            # Should have at least: request, plan, completion
-            event_types = {entry.event_type for entry in trace}
-            assert "request_submitted" in event_types
-            assert "analysis_completed" in event_types
+        request = AnalysisRequest(
+            request_id="test-req-4",
+            intent="Test audit trail",
+            data_sources=["db"],
+        )
+        
+        shared_agent.analyze(request)
+        
+        # Verify audit log has entries
+        trace = shared_agent.get_request_trace("test-req-4")
+        
+        assert len(trace) > 0
+        
+        # Should have at least: request, plan, completion; one request and completion each
+        counts = Counter(entry.event_type for entry in trace)
+        assert counts["request_submitted"] == 1
+        assert counts["analysis_completed"] == 1
     
-    def test_error_handling_for_orchestration_failure(self):
+    def test_buffered_audit_written_when_analyze_returns(self, shared_agent):
+        """Buffered audit events must be on disk once analyze() returns."""
+        request = AnalysisRequest(
+            request_id="test-req-4b",
+            intent="Test audit flush",
+            data_sources=["db"],
+        )
+        shared_agent.analyze(request)
+        
+        log_text = shared_agent.audit_tracer.log.log_path.read_text()
+        
+        assert '"test-req-4b-request"' in log_text
+        assert '"test-req-4b-complete"' in log_text
+    
+    def test_error_handling_for_orchestration_failure(self, agent_paths):
         """DataAgent must handle catastrophic failures gracefully."""
         # Tool that raises during execution
-        mock_tool = Mock(side_effect=RuntimeError("Database connection lost"))
-        tool_registry = {"sql_runner": mock_tool}
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-5",
-                intent="This will fail",
-                data_sources=["db"],
-            )
-            
-            response = agent.analyze(request)
-            
-            assert response.status == AnalysisStatus.FAILURE
-            assert response.error_message is not None
-            assert "Database connection lost" in response.error_message or response.metrics.get("error_id")
+        recipes_db, audit_log = agent_paths
+        agent = DataAgent(
+            tool_registry=SQL_FAILURE_TOOL_REGISTRY,
+            recipe_store_path=recipes_db,
+            audit_log_path=audit_log,
+        )
+        
+        request = AnalysisRequest(
+            request_id="test-req-5",
+            intent="This will fail",
+            data_sources=["db"],
+        )
+        
+        response = agent.analyze(request)
+        
+        assert response.status == AnalysisStatus.FAILURE
+        assert response.error_message is not None
+        assert "Database connection lost" in response.error_message or response.metrics.get("error_id")
     
-    def test_metrics_collection(self):
+    def test_metrics_collection(self, shared_agent):
         """DataAgent must collect performance metrics."""
-        mock_tool = Mock(return_value=pd.DataFrame({"x": [1, 2, 3]}))
-        tool_registry = {"sql_runner": mock_tool}
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-6",
-                intent="Collect metrics",
-                data_sources=["db"],
-            )
-            
-            response = agent.analyze(request)
-            
-            assert "total_duration_seconds" in response.metrics
-            assert response.metrics["total_duration_seconds"] > 0
-            assert "total_steps" in response.metrics
-            assert "successful_steps" in response.metrics
-            assert "failed_steps" in response.metrics
-            assert "artifact_count" in response.metrics
+        request = AnalysisRequest(
+            request_id="test-req-6",
+            intent="Collect metrics",
+            data_sources=["db"],
+        )
+        
+        response = shared_agent.analyze(request)
+        
+        assert "total_duration_seconds" in response.metrics
+        assert response.metrics["total_duration_seconds"] > 0
+        assert "total_steps" in response.metrics
+        assert "successful_steps" in response.metrics
+        assert "failed_steps" in response.metrics
+        assert "artifact_count" in response.metrics
     
-    def test_verify_audit_integrity(self):
+    def test_verify_audit_integrity(self, shared_agent):
         """DataAgent must allow audit integrity verification."""
-        mock_tool = Mock(return_value=pd.DataFrame({"x": [1]}))
-        tool_registry = {"sql_runner": mock_tool}
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            agent = DataAgent(
-                tool_registry=tool_registry,
-                recipe_store_path=str(Path(tmpdir) / "recipes.db"),
-                audit_log_path=str(Path(tmpdir) / "audit.jsonl"),
-            )
-            
-            request = AnalysisRequest(
-                request_id="test-req-7",
-                intent="Test integrity",
-                data_sources=["db"],
-            )
-            
-            agent.analyze(request)
-            
-            is_valid, error = agent.verify_audit_integrity()
-            
-            assert is_valid is True
-            assert error is None
\ No newline at end of file
+        request = AnalysisRequest(
+            request_id="test-req-7",
+            intent="Test integrity",
+            data_sources=["db"],
+        )
+        
+        shared_agent.analyze(request)
+        
+        is_valid, error = shared_agent.verify_audit_integrity()
+        
+        assert is_valid is True
+        assert error is None
\ No newline at end of file
@@ -1,38 +1,65 @@
 """Integration tests for Planner workflow (T025-T026)."""
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from lib.agents.data_agent.planner import (
     IntentParser,
+    ParsedIntent,
     PlanBuilder,
     Operation,
 )
 
 
+# Parsed LLM responses; JSON decoding is covered by the IntentParser contract tests.
+TOP_REGIONS_INTENT = ParsedIntent(
+    objective="Identify top revenue-generating regions",
+    data_requirements=["sales table", "region column", "revenue column"],
+    operations=[
+        Operation("op1", "Query sales data for Q4", []),
+        Operation("op2", "Group by region", ["op1"]),
+        Operation("op3", "Aggregate revenue sum", ["op2"]),
+        Operation("op4", "Sort descending by revenue", ["op3"]),
+        Operation("op5", "Take top 5 regions", ["op4"]),
+        Operation("op6", "Visualize as bar chart", ["op5"]),
+    ],
+    deliverables=["ranked table", "bar chart"],
+    constraints=["enforce row limit", "no PII access"],
+)
+CROSS_DIMENSION_INTENT = ParsedIntent(
+    objective="Compare metrics across dimensions",
+    data_requirements=["sales", "customers"],
+    operations=[
+        Operation("op1", "Query sales data", []),
+        Operation("op2", "Profile sales schema", ["op1"]),
+        Operation("op3", "Query customer data", []),
+        Operation("op4", "Join sales with customers", ["op1", "op3"]),
+        Operation("op5", "Calculate metrics", ["op4"]),
+    ],
+    deliverables=["summary table"],
+    constraints=["row_limit=10000"],
+)
+
+
+@pytest.fixture(scope="class")
+def mock_anthropic():
+    """Patch the Anthropic client once per test class."""
+    with patch('lib.agents.data_agent.planner.intent_parser.Anthropic') as mock_anthropic:
+        yield mock_anthropic
+
+
+@pytest.fixture(scope="class")
+def parser(mock_anthropic):
+    """IntentParser bound to the patched Anthropic client."""
+    return IntentParser(api_key="test-key")
+
+
 class TestPlannerIntegration:
     """End-to-end tests for intent parsing → plan building workflow."""
     
-    @patch('lib.agents.data_agent.planner.intent_parser.Anthropic')
-    def test_full_planner_workflow(self, mock_anthropic):
+    def test_full_planner_workflow(self, parser, monkeypatch):
         """Test complete flow from natural language to validated plan."""
-        mock_response = Mock()
-        mock_response.content = [Mock(text='''{
-            "objective": "Identify top revenue-generating regions",
-            "data_requirements": ["sales table", "region column", "revenue column"],
-            "operations": [
-                {"id": "op1", "description": "Query sales data for Q4", "dependencies": []},
-                {"id": "op2", "description": "Group by region", "dependencies": ["op1"]},
-                {"id": "op3", "description": "Aggregate revenue sum", "dependencies": ["op2"]},
-                {"id": "op4", "description": "Sort descending by revenue", "dependencies": ["op3"]},
-                {"id": "op5", "description": "Take top 5 regions", "dependencies": ["op4"]},
-                {"id": "op6", "description": "Visualize as bar chart", "dependencies": ["op5"]}
-            ],
-            "deliverables": ["ranked table", "bar chart"],
-            "constraints": ["enforce row limit", "no PII access"]
-        }''')]
-        mock_anthropic.return_value.messages.create.return_value = mock_response
-        
-        parser = IntentParser(api_key="test-key")
+        monkeypatch.setattr(parser, "_parse_response", lambda _: TOP_REGIONS_INTENT)
+        
         builder = PlanBuilder()
         
         parsed = parser.parse(
@@ -57,26 +84,10 @@ class TestPlannerIntegration:
         assert plan.total_cost > 0
         assert "bar chart" in plan.deliverables
     
-    @patch('lib.agents.data_agent.planner.intent_parser.Anthropic')
-    def test_planner_with_complex_dag(self, mock_anthropic):
+    def test_planner_with_complex_dag(self, parser, monkeypatch):
         """Test plan building with multiple dependency paths."""
-        mock_response = Mock()
-        mock_response.content = [Mock(text='''{
-            "objective": "Compare metrics across dimensions",
-            "data_requirements": ["sales", "customers"],
-            "operations": [
-                {"id": "op1", "description": "Query sales data", "dependencies": []},
-                {"id": "op2", "description": "Profile sales schema", "dependencies": ["op1"]},
-                {"id": "op3", "description": "Query customer data", "dependencies": []},
-                {"id": "op4", "description": "Join sales with customers", "dependencies": ["op1", "op3"]},
-                {"id": "op5", "description": "Calculate metrics", "dependencies": ["op4"]}
-            ],
-            "deliverables": ["summary table"],
-            "constraints": ["row_limit=10000"]
-        }''')]
-        mock_anthropic.return_value.messages.create.return_value = mock_response
-        
-        parser = IntentParser(api_key="test-key")
+        monkeypatch.setattr(parser, "_parse_response", lambda _: CROSS_DIMENSION_INTENT)
+        
         builder = PlanBuilder()
         
         parsed = parser.parse("Compare sales and customer metrics", ["sql_runner", "df_operations", "profiler"])
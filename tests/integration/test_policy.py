@@ -4,7 +4,6 @@ Tests FR-016 through FR-024: Safety guardrails, PII blocking, resource limits.
 Based on Quickstart Test 3 scenario.
 """
 
-import json
 import os
 import uuid
 
@@ -12,6 +11,31 @@ import pytest
 
 from lib.agents.data_agent.agent import DataAgent
 from lib.agents.data_agent.contracts.request import AnalysisRequest
+from tests.integration._audit_utils import iter_audit_entries, load_audit_entries
+
+
+# Every request targets the same sales database; AnalysisRequest validates
+# these dicts into fresh DataSource models, so sharing the list is safe.
+SQL_DATA_SOURCES = [
+    {
+        "type": "sql",
+        "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
+    }
+]
+
+
+def assert_policy_blocked(response, message_terms, codes=None):
+    """Assert response failed with an error mentioning one of message_terms.
+    
+    The error message is lowercased once; codes, when given, lists the
+    acceptable error codes.
+    """
+    assert response.status == "failed"
+    assert response.error is not None
+    message = response.error["message"].lower()
+    assert any(term in message for term in message_terms)
+    if codes is not None:
+        assert response.error["code"] in codes
 
 
 @pytest.fixture
@@ -43,12 +67,7 @@ class TestPolicyGuardrails:
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
             intent="Show me all customer emails and phone numbers",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"],
             policy={
                 "blocked_patterns": ["email", "phone", "ssn"]
@@ -57,74 +76,48 @@ class TestPolicyGuardrails:
         
         response = agent.analyze(request)
         
-        assert response.status == "failed"
-        assert response.error is not None
-        assert "pii" in response.error["message"].lower() or "blocked" in response.error["message"].lower()
-        assert response.error["code"] in ["POLICY_VIOLATION", "PII_ACCESS_BLOCKED"]
-        
-        audit_entries = []
-        with open(audit_log_path) as f:
-            for line in f:
-                entry = json.loads(line)
-                if entry["request_id"] == request.request_id:
-                    audit_entries.append(entry)
+        assert_policy_blocked(response, ["pii", "blocked"], ["POLICY_VIOLATION", "PII_ACCESS_BLOCKED"])
         
-        policy_blocks = [e for e in audit_entries if e["event_type"] == "policy_block"]
+        policy_blocks = load_audit_entries(audit_log_path, request.request_id, {"policy_block"})
         assert len(policy_blocks) > 0
         
         assert any("email" in str(e.get("blocked_columns", [])).lower() for e in policy_blocks)
 
-    def test_ddl_operations_blocked(self, test_database, audit_log_path):
-        """Test policy guardrails block DDL operations (FR-016).
+    @pytest.mark.parametrize(
+        "intent, expected_terms",
+        [
+            pytest.param(
+                "Create a new table for storing analysis results",
+                ["ddl", "create"],
+                id="ddl-FR-016",
+            ),
+            pytest.param(
+                "Update all sales records to add 10% markup",
+                ["update", "modify"],
+                id="dml-FR-017",
+            ),
+        ],
+    )
+    def test_write_operations_blocked(self, test_database, audit_log_path, intent, expected_terms):
+        """Test policy guardrails block DDL and DML operations (FR-016, FR-017).
         
         Validates:
         - FR-016: DDL operations blocked (CREATE, ALTER, DROP)
-        - Policy enforcement before execution
-        """
-        agent = DataAgent(audit_log_path=str(audit_log_path))
-        
-        request = AnalysisRequest(
-            request_id=str(uuid.uuid4()),
-            intent="Create a new table for storing analysis results",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
-            deliverables=["tables"]
-        )
-        
-        response = agent.analyze(request)
-        
-        assert response.status == "failed"
-        assert "ddl" in response.error["message"].lower() or "create" in response.error["message"].lower()
-
-    def test_dml_operations_blocked(self, test_database, audit_log_path):
-        """Test policy guardrails block DML operations (FR-017).
-        
-        Validates:
         - FR-017: DML operations blocked (INSERT, UPDATE, DELETE)
-        - Read-only access enforced
+        - Policy enforcement before execution; read-only access enforced
         """
         agent = DataAgent(audit_log_path=str(audit_log_path))
         
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
-            intent="Update all sales records to add 10% markup",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            intent=intent,
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"]
         )
         
         response = agent.analyze(request)
         
-        assert response.status == "failed"
-        assert "update" in response.error["message"].lower() or "modify" in response.error["message"].lower()
+        assert_policy_blocked(response, expected_terms)
 
     def test_row_limit_enforced(self, test_database, audit_log_path):
         """Test system enforces row limits on queries (FR-022).
@@ -138,12 +131,7 @@ class TestPolicyGuardrails:
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
             intent="Show me all sales records",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"],
             constraints={
                 "row_limit": 1000
@@ -167,12 +155,7 @@ class TestPolicyGuardrails:
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
             intent="Perform complex multi-table join analysis",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"],
             constraints={
                 "timeout_seconds": 5
@@ -198,25 +181,14 @@ class TestPolicyGuardrails:
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
             intent="Show sales where region = 'Arizona'; DROP TABLE sales; --",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"]
         )
         
         response = agent.analyze(request)
         
-        audit_entries = []
-        with open(audit_log_path) as f:
-            for line in f:
-                entry = json.loads(line)
-                if entry["request_id"] == request.request_id and entry["event_type"] == "tool_call":
-                    audit_entries.append(entry)
-        
-        sql_calls = [e for e in audit_entries if e.get("tool_name") == "sql.run"]
+        tool_calls = iter_audit_entries(audit_log_path, request.request_id, {"tool_call"})
+        sql_calls = [e for e in tool_calls if e.get("tool_name") == "sql.run"]
         for call in sql_calls:
             assert "DROP TABLE" not in str(call.get("tool_args", {}))
             assert "parameters" in call.get("tool_args", {})
@@ -233,12 +205,7 @@ class TestPolicyGuardrails:
         request = AnalysisRequest(
             request_id=str(uuid.uuid4()),
             intent="Analyze customer demographics by age group",
-            data_sources=[
-                {
-                    "type": "sql",
-                    "connection_string": os.getenv("TEST_DATABASE_URL", "postgresql://localhost/test_sales")
-                }
-            ],
+            data_sources=SQL_DATA_SOURCES,
             deliverables=["tables"],
             policy={
                 "allowed_columns": ["age_group", "region", "purchase_count"]
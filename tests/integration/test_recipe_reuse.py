@@ -16,9 +16,21 @@ from lib.agents.data_agent.contracts.request import AnalysisRequest
 pytestmark = pytest.mark.integration
 
 
-@pytest.fixture
-def data_agent():
-    """Create DataAgent instance for testing."""
+# Template request; tests derive variants with model_copy(update=...) instead of mutating it.
+SAMPLE_REQUEST = AnalysisRequest(
+    request_id="test-recipe-001",
+    intent="Show quarterly sales trends by region",
+    data_sources=[
+        {"type": "sql", "connection_string": "postgresql://localhost/test_db"}
+    ],
+    deliverables=["tables", "charts"],
+    constraints={"row_limit": 10000, "timeout_seconds": 30},
+)
+
+
+@pytest.fixture(scope="module")
+def data_agent(tmp_path_factory, shared_embedder):
+    """Create one DataAgent shared by every test in the module."""
     def mock_sql(**kwargs):
         return {"status": "success", "data": [{"month": "Q1", "sales": 1000, "region": "AZ"}]}
     
@@ -37,21 +49,28 @@ def data_agent():
         "plotter": mock_plotter,
         "profiler": mock_profiler,
     }
-    return DataAgent(tool_registry=tool_registry)
+    agent_dir = tmp_path_factory.mktemp("recipe_reuse")
+    return DataAgent(
+        tool_registry=tool_registry,
+        recipe_store_path=":memory:",
+        audit_log_path=str(agent_dir / "audit.jsonl"),
+        recipe_embedder=shared_embedder,
+    )
+
+
+@pytest.fixture(autouse=True)
+def empty_recipe_store(data_agent):
+    """Start every test with no recipes in the shared agent's store."""
+    store = data_agent.recipe_store
+    # LIMIT -1 is SQLite for "no limit"
+    for recipe in store.list_recipes(limit=-1):
+        store.delete_recipe(recipe.recipe_id)
 
 
 @pytest.fixture
 def sample_request():
     """Create sample analysis request."""
-    return AnalysisRequest(
-        request_id="test-recipe-001",
-        intent="Show quarterly sales trends by region",
-        data_sources=[
-            {"type": "sql", "connection_string": "postgresql://localhost/test_db"}
-        ],
-        deliverables=["tables", "charts"],
-        constraints={"row_limit": 10000, "timeout_seconds": 30},
-    )
+    return SAMPLE_REQUEST
 
 
 class TestRecipeReuse:
@@ -88,9 +107,11 @@ class TestRecipeReuse:
         recipe_id_1 = response1.recipe_id
         
         # Second request: similar intent, same schema (should reuse recipe)
-        sample_request.request_id = "test-recipe-002"
-        sample_request.intent = "Display regional sales by quarter"  # Similar intent
-        response2 = data_agent.analyze(sample_request)
+        similar_request = sample_request.model_copy(update={
+            "request_id": "test-recipe-002",
+            "intent": "Display regional sales by quarter",  # Similar intent
+        })
+        response2 = data_agent.analyze(similar_request)
         
         assert response2.recipe_id == recipe_id_1, "Should reuse existing recipe"
         assert response2.metrics.recipe_reused is True
@@ -101,9 +122,11 @@ class TestRecipeReuse:
         response1 = data_agent.analyze(sample_request)
         
         # Second request: similar structure, different columns
-        sample_request.request_id = "test-recipe-003"
-        sample_request.intent = "Show quarterly revenue trends by region"  # Revenue vs Sales
-        response2 = data_agent.analyze(sample_request)
+        revenue_request = sample_request.model_copy(update={
+            "request_id": "test-recipe-003",
+            "intent": "Show quarterly revenue trends by region",  # Revenue vs Sales
+        })
+        response2 = data_agent.analyze(revenue_request)
         
         # Should adapt recipe (column name change: sales → revenue)
         assert response2.status == "completed"
@@ -116,11 +139,13 @@ class TestRecipeReuse:
         response1 = data_agent.analyze(sample_request)
         
         # Second request: different database schema
-        sample_request.request_id = "test-recipe-004"
-        sample_request.data_sources = [
-            {"type": "sql", "connection_string": "postgresql://localhost/inventory_db"}
-        ]
-        response2 = data_agent.analyze(sample_request)
+        inventory_request = sample_request.model_copy(update={
+            "request_id": "test-recipe-004",
+            "data_sources": [
+                {"type": "sql", "connection_string": "postgresql://localhost/inventory_db"}
+            ],
+        })
+        response2 = data_agent.analyze(inventory_request)
         
         assert response2.recipe_id != response1.recipe_id, "Different schemas should use different recipes"
         assert response2.metrics.recipe_reused is False
\ No newline at end of file
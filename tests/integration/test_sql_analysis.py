@@ -4,15 +4,15 @@ Tests FR-001 through FR-006, FR-043: End-to-end SQL analysis with artifacts and
 Based on Quickstart Test 1 scenario.
 """
 
-import json
 import os
-import uuid
 from pathlib import Path
 
 import pytest
 
 from lib.agents.data_agent.agent import DataAgent
 from lib.agents.data_agent.contracts.request import AnalysisRequest
+from tests.integration._audit_utils import load_audit_entries
+from tests.integration._ids import next_id
 
 
 @pytest.fixture
@@ -28,6 +28,7 @@ def audit_log_path(tmp_path):
     return log_path
 
 
+@pytest.mark.xdist_group(name="sql_analysis")
 class TestSQLAnalysisWorkflow:
     """Test SQL-based analysis end-to-end workflow."""
 
@@ -46,7 +47,7 @@ class TestSQLAnalysisWorkflow:
         agent = DataAgent(audit_log_path=str(audit_log_path))
         
         request = AnalysisRequest(
-            request_id=str(uuid.uuid4()),
+            request_id=next_id(),
             intent="Analyze Q1 2021 Arizona sales; trends + charts",
             data_sources=[
                 {
@@ -80,21 +81,16 @@ class TestSQLAnalysisWorkflow:
         
         assert response.audit_log_ref is not None
         
-        audit_entries = []
-        with open(audit_log_path) as f:
-            for line in f:
-                entry = json.loads(line)
-                if entry["request_id"] == request.request_id:
-                    audit_entries.append(entry)
+        audit_entries = load_audit_entries(audit_log_path, request.request_id)
         
         assert len(audit_entries) > 0
-        assert any(e["event_type"] == "plan_generated" for e in audit_entries)
-        assert any(e["event_type"] == "tool_call" for e in audit_entries)
-        assert any(e["event_type"] == "artifact_created" for e in audit_entries)
+        event_types = {e["event_type"] for e in audit_entries}
+        assert {"plan_generated", "tool_call", "artifact_created"} <= event_types
         
-        for i in range(1, len(audit_entries)):
-            assert "parent_hash" in audit_entries[i]
-            assert audit_entries[i]["parent_hash"] == audit_entries[i-1]["trace_hash"]
+        assert all("parent_hash" in e for e in audit_entries[1:])
+        parents = [e["parent_hash"] for e in audit_entries[1:]]
+        traces = [e["trace_hash"] for e in audit_entries[:-1]]
+        assert parents == traces
 
     def test_multi_source_analysis(self, test_database, audit_log_path):
         """Test analysis spanning SQL database and CSV file (FR-014).
@@ -107,7 +103,7 @@ class TestSQLAnalysisWorkflow:
         agent = DataAgent(audit_log_path=str(audit_log_path))
         
         request = AnalysisRequest(
-            request_id=str(uuid.uuid4()),
+            request_id=next_id(),
             intent="Join customer database with product catalog CSV; analyze purchase patterns",
             data_sources=[
                 {
@@ -132,7 +128,7 @@ class TestSQLAnalysisWorkflow:
         agent = DataAgent(audit_log_path=str(audit_log_path))
         
         request = AnalysisRequest(
-            request_id=str(uuid.uuid4()),
+            request_id=next_id(),
             intent="Calculate monthly sales averages for 2021",
             data_sources=[
                 {
@@ -0,0 +1,52 @@
+"""Shared fixtures for unit tests.
+
+The planner, policy and fingerprinting classes under test keep no state
+between calls, so one instance per module is shared by every test that
+uses the default configuration. Tests that need a custom configuration
+still construct their own.
+
+SchemaFingerprinter is imported inside its fixture because its module pulls
+in pandas, which would otherwise be imported for every unit test run.
+"""
+
+import pytest
+
+from lib.agents.data_agent.planner.plan_builder import PlanBuilder
+from lib.agents.data_agent.safety.policy import (
+    ColumnAccessControl,
+    PIIDetector,
+    PolicyEnforcer,
+    SQLPolicyChecker,
+)
+
+
+@pytest.fixture(scope="module")
+def plan_builder():
+    return PlanBuilder()
+
+
+@pytest.fixture(scope="module")
+def sql_checker():
+    return SQLPolicyChecker()
+
+
+@pytest.fixture(scope="module")
+def pii_detector():
+    return PIIDetector()
+
+
+@pytest.fixture(scope="module")
+def column_access():
+    return ColumnAccessControl()
+
+
+@pytest.fixture(scope="module")
+def policy_enforcer():
+    return PolicyEnforcer()
+
+
+@pytest.fixture(scope="module")
+def fingerprinter():
+    from lib.agents.data_agent.memory.schema_fingerprint import SchemaFingerprinter
+    
+    return SchemaFingerprinter(normalize_types=True)
@@ -0,0 +1,50 @@
+"""Unit tests for the integration-test audit log helpers."""
+
+import pytest
+
+from lib.agents.data_agent.audit.merkle_log import MerkleLog
+from tests.integration._audit_utils import iter_audit_entries, load_audit_entries
+
+
+pytestmark = pytest.mark.parallel
+
+REQUEST_ID = "req-1"
+OTHER_REQUEST_ID = "req-2"
+
+
+@pytest.fixture
+def audit_log_path(tmp_path):
+    """A real MerkleLog file with entries for two interleaved requests."""
+    path = tmp_path / "audit.jsonl"
+    log = MerkleLog(path)
+    log.append(f"{REQUEST_ID}-request", "request_submitted", {"request_id": REQUEST_ID})
+    log.append(f"{OTHER_REQUEST_ID}-request", "request_submitted", {"request_id": OTHER_REQUEST_ID})
+    log.append("art-1-artifact", "artifact_generated", {"request_id": REQUEST_ID, "artifact_id": "art-1"})
+    log.append(f"{REQUEST_ID}-plan-p1", "plan_created", {"plan_id": "p1"})
+    log.append("call-1-call", "tool_called", {"tool_name": "sql_runner", "query": REQUEST_ID})
+    log.close()
+    return path
+
+
+class TestAuditEntryLookup:
+    """Unit tests for iter_audit_entries/load_audit_entries."""
+    
+    def test_matches_data_request_id_or_entry_id_prefix(self, audit_log_path):
+        entries = load_audit_entries(audit_log_path, REQUEST_ID)
+        
+        assert [entry["entry_id"] for entry in entries] == [
+            f"{REQUEST_ID}-request",
+            "art-1-artifact",
+            f"{REQUEST_ID}-plan-p1",
+        ]
+    
+    def test_filters_by_event_type(self, audit_log_path):
+        entries = iter_audit_entries(audit_log_path, REQUEST_ID, {"plan_created"})
+        
+        assert [entry["entry_id"] for entry in entries] == [f"{REQUEST_ID}-plan-p1"]
+    
+    def test_empty_log_yields_nothing(self, tmp_path):
+        path = tmp_path / "empty.jsonl"
+        path.touch()
+        
+        assert load_audit_entries(path, REQUEST_ID) == []
@@ -1,117 +1,141 @@
 """Unit tests for database connection utilities."""
 
+import sqlite3
+
 import pytest
-import tempfile
-from pathlib import Path
 
 from lib.agents.data_agent.db.connection import DatabaseConnection
 
 
+@pytest.fixture
+def memory_db():
+    """In-memory DatabaseConnection; tables persist across get_connection() calls."""
+    return DatabaseConnection(db_path=":memory:")
+
+
 class TestDatabaseConnection:
     """Tests for DatabaseConnection utility."""
     
-    def test_sqlite_connection_context_manager(self):
+    def test_sqlite_connection_context_manager(self, memory_db):
         """DatabaseConnection must provide working SQLite context manager."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = DatabaseConnection(db_path=db_path)
-            
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("CREATE TABLE test (id INTEGER, value TEXT)")
-                cursor.execute("INSERT INTO test VALUES (1, 'hello')")
-            
-            # Verify data persisted
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM test")
-                rows = cursor.fetchall()
-                assert len(rows) == 1
-                assert rows[0] == (1, "hello")
+        with memory_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("CREATE TABLE test (id INTEGER, value TEXT)")
+            cursor.execute("INSERT INTO test VALUES (1, 'hello')")
+        
+        # Verify data persisted
+        with memory_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM test")
+            rows = cursor.fetchall()
+            assert len(rows) == 1
+            assert rows[0] == (1, "hello")
     
-    def test_run_migrations_creates_tracking_table(self):
+    def test_run_migrations_creates_tracking_table(self, memory_db, tmp_path):
         """DatabaseConnection must create schema_migrations tracking table."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = DatabaseConnection(db_path=db_path)
-            
-            # Create empty migrations dir
-            migrations_dir = Path(tmpdir) / "migrations"
-            migrations_dir.mkdir()
-            
-            db.run_migrations(str(migrations_dir))
-            
-            # Verify tracking table exists
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'"
-                )
-                assert cursor.fetchone() is not None
+        # Create empty migrations dir
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        
+        memory_db.run_migrations(str(migrations_dir))
+        
+        # Verify tracking table exists
+        with memory_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'"
+            )
+            assert cursor.fetchone() is not None
     
-    def test_run_migrations_applies_pending_migrations(self):
+    def test_run_migrations_applies_pending_migrations(self, memory_db, tmp_path):
         """DatabaseConnection must apply pending migrations in order."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = DatabaseConnection(db_path=db_path)
-            
-            # Create migrations
-            migrations_dir = Path(tmpdir) / "migrations"
-            migrations_dir.mkdir()
-            
-            (migrations_dir / "001_create_users.sql").write_text(
-                "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"
-            )
-            (migrations_dir / "002_create_posts.sql").write_text(
-                "CREATE TABLE posts (id INTEGER PRIMARY KEY, user_id INTEGER, content TEXT)"
+        # Create migrations
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        
+        (migrations_dir / "001_create_users.sql").write_text(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)"
+        )
+        (migrations_dir / "002_create_posts.sql").write_text(
+            "CREATE TABLE posts (id INTEGER PRIMARY KEY, user_id INTEGER, content TEXT)"
+        )
+        
+        memory_db.run_migrations(str(migrations_dir))
+        
+        # Verify both tables exist
+        with memory_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
             )
-            
-            db.run_migrations(str(migrations_dir))
-            
-            # Verify both tables exist
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
-                )
-                tables = [row[0] for row in cursor.fetchall()]
-                assert "users" in tables
-                assert "posts" in tables
-                assert "schema_migrations" in tables
+            tables = [row[0] for row in cursor.fetchall()]
+            assert "users" in tables
+            assert "posts" in tables
+            assert "schema_migrations" in tables
     
-    def test_run_migrations_skips_applied_migrations(self):
+    def test_run_migrations_skips_applied_migrations(self, memory_db, tmp_path):
         """DatabaseConnection must not re-apply already applied migrations."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = DatabaseConnection(db_path=db_path)
-            
-            migrations_dir = Path(tmpdir) / "migrations"
-            migrations_dir.mkdir()
-            
-            (migrations_dir / "001_create_test.sql").write_text(
-                "CREATE TABLE test (id INTEGER PRIMARY KEY)"
-            )
-            
-            # Apply first time
-            db.run_migrations(str(migrations_dir))
-            
-            # Apply again - should not error
-            db.run_migrations(str(migrations_dir))
-            
-            # Verify only one migration recorded
-            with db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM schema_migrations")
-                count = cursor.fetchone()[0]
-                assert count == 1
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        
+        (migrations_dir / "001_create_test.sql").write_text(
+            "CREATE TABLE test (id INTEGER PRIMARY KEY)"
+        )
+        
+        # Apply first time
+        assert memory_db.run_migrations(str(migrations_dir)) == ["001_create_test.sql"]
+        
+        # Apply again - should not error or re-run anything
+        assert memory_db.run_migrations(str(migrations_dir)) == []
+        
+        # Verify only one migration recorded
+        with memory_db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM schema_migrations")
+            count = cursor.fetchone()[0]
+            assert count == 1
     
-    def test_check_connection_returns_true_when_working(self):
+    def test_run_migrations_picks_up_new_migration_files(self, memory_db, tmp_path):
+        """DatabaseConnection must apply migrations added after an earlier run."""
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        
+        (migrations_dir / "001_create_users.sql").write_text(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY)"
+        )
+        memory_db.run_migrations(str(migrations_dir))
+        
+        (migrations_dir / "002_create_posts.sql").write_text(
+            "CREATE TABLE posts (id INTEGER PRIMARY KEY)"
+        )
+        memory_db.run_migrations(str(migrations_dir))
+        
+        with memory_db.get_connection() as conn:
+            cursor = conn.execute("SELECT migration_id FROM schema_migrations ORDER BY migration_id")
+            assert [row[0] for row in cursor.fetchall()] == ["001_create_users.sql", "002_create_posts.sql"]
+    
+    def test_run_migrations_rolls_back_batch_on_failure(self, memory_db, tmp_path):
+        """DatabaseConnection must apply no migration when any pending one fails."""
+        migrations_dir = tmp_path / "migrations"
+        migrations_dir.mkdir()
+        
+        (migrations_dir / "001_create_users.sql").write_text(
+            "CREATE TABLE users (id INTEGER PRIMARY KEY, note TEXT DEFAULT 'a;b');\n"
+            "INSERT INTO users (id) VALUES (1);"
+        )
+        (migrations_dir / "002_broken.sql").write_text("CREATE TABLE posts (id INTEGER PRIMARY KEY;")
+        
+        with pytest.raises(sqlite3.Error):
+            memory_db.run_migrations(str(migrations_dir))
+        
+        with memory_db.get_connection() as conn:
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+            assert [row[0] for row in cursor.fetchall()] == ["schema_migrations"]
+            assert conn.execute("SELECT COUNT(*) FROM schema_migrations").fetchone()[0] == 0
+    
+    def test_check_connection_returns_true_when_working(self, memory_db):
         """DatabaseConnection must return True for working connection."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = str(Path(tmpdir) / "test.db")
-            db = DatabaseConnection(db_path=db_path)
-            
-            assert db.check_connection() is True
+        assert memory_db.check_connection() is True
     
     def test_check_connection_returns_false_on_error(self):
         """DatabaseConnection must return False for failed connection."""
@@ -121,22 +145,32 @@ class TestDatabaseConnection:
         # check_connection should handle error gracefully
         assert db.check_connection() is False
     
-    def test_reset_database_deletes_sqlite_file(self):
+    def test_reset_database_deletes_sqlite_file(self, tmp_path):
         """DatabaseConnection must delete SQLite file on reset."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            db_path = Path(tmpdir) / "test.db"
-            db = DatabaseConnection(db_path=str(db_path))
-            
-            # Create database
-            with db.get_connection() as conn:
-                conn.execute("CREATE TABLE test (id INTEGER)")
-            
-            assert db_path.exists()
-            
-            # Reset
-            db.reset_database()
-            
-            assert not db_path.exists()
+        db_path = tmp_path / "test.db"
+        db = DatabaseConnection(db_path=str(db_path))
+        
+        # Create database
+        with db.get_connection() as conn:
+            conn.execute("CREATE TABLE test (id INTEGER)")
+        
+        assert db_path.exists()
+        
+        # Reset
+        db.reset_database()
+        
+        assert not db_path.exists()
+    
+    def test_reset_database_replaces_in_memory_database(self, memory_db):
+        """DatabaseConnection must drop in-memory tables on reset."""
+        with memory_db.get_connection() as conn:
+            conn.execute("CREATE TABLE test (id INTEGER)")
+        
+        memory_db.reset_database()
+        
+        with memory_db.get_connection() as conn:
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            assert cursor.fetchall() == []
     
     def test_postgres_requires_connection_string(self):
         """DatabaseConnection must require connection_string for Postgres."""
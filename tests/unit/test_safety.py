@@ -1,11 +1,12 @@
 """Unit tests for safety guardrails."""
 
+import sqlite3
+import threading
+import time
+
 import pytest
 from lib.agents.data_agent.safety.policy import (
-    SQLPolicyChecker,
-    PIIDetector,
     ColumnAccessControl,
-    PolicyEnforcer,
     PolicyResult,
     PIIMatch,
 )
@@ -16,83 +17,46 @@ from lib.agents.data_agent.safety.sandbox import (
 )
 
 
+pytestmark = pytest.mark.parallel
+
+
 class TestSQLPolicyChecker:
     """Unit tests for SQL policy checker."""
     
-    def test_allow_safe_query(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("SELECT id, name FROM users WHERE age > 18")
+    def test_allow_safe_query(self, sql_checker):
+        result = sql_checker.check_query("SELECT id, name FROM users WHERE age > 18")
         
         assert result.allowed is True
         assert len(result.violations) == 0
         assert result.severity == "none"
     
-    def test_block_ddl_create(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("CREATE TABLE users (id INT)")
-        
-        assert result.allowed is False
-        assert any("DDL" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_block_ddl_drop(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("DROP TABLE users")
-        
-        assert result.allowed is False
-        assert any("DDL" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_block_ddl_alter(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("ALTER TABLE users ADD COLUMN email VARCHAR(255)")
+    @pytest.mark.parametrize(
+        "query, category",
+        [
+            pytest.param("CREATE TABLE users (id INT)", "DDL", id="ddl_create"),
+            pytest.param("DROP TABLE users", "DDL", id="ddl_drop"),
+            pytest.param("ALTER TABLE users ADD COLUMN email VARCHAR(255)", "DDL", id="ddl_alter"),
+            pytest.param("INSERT INTO users (name) VALUES ('Alice')", "DML", id="dml_insert"),
+            pytest.param("UPDATE users SET name = 'Bob' WHERE id = 1", "DML", id="dml_update"),
+            pytest.param("DELETE FROM users WHERE id = 1", "DML", id="dml_delete"),
+            pytest.param("EXEC sp_executesql @sql", "Dangerous", id="dangerous_exec"),
+        ],
+    )
+    def test_block_statement(self, sql_checker, query, category):
+        result = sql_checker.check_query(query)
         
         assert result.allowed is False
-        assert any("DDL" in v for v in result.violations)
+        assert any(category in v for v in result.violations)
         assert result.severity == "critical"
     
-    def test_block_dml_insert(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("INSERT INTO users (name) VALUES ('Alice')")
-        
-        assert result.allowed is False
-        assert any("DML" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_block_dml_update(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("UPDATE users SET name = 'Bob' WHERE id = 1")
-        
-        assert result.allowed is False
-        assert any("DML" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_block_dml_delete(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("DELETE FROM users WHERE id = 1")
-        
-        assert result.allowed is False
-        assert any("DML" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_block_dangerous_exec(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("EXEC sp_executesql @sql")
-        
-        assert result.allowed is False
-        assert any("Dangerous" in v for v in result.violations)
-        assert result.severity == "critical"
-    
-    def test_detect_sql_comment_injection(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("SELECT * FROM users WHERE id = 1 -- DROP TABLE users")
+    def test_detect_sql_comment_injection(self, sql_checker):
+        result = sql_checker.check_query("SELECT * FROM users WHERE id = 1 -- DROP TABLE users")
         
         assert result.allowed is False
         assert any("comment" in v.lower() for v in result.violations)
     
-    def test_detect_multiple_statements(self):
-        checker = SQLPolicyChecker()
-        result = checker.check_query("SELECT * FROM users; DROP TABLE users;")
+    def test_detect_multiple_statements(self, sql_checker):
+        result = sql_checker.check_query("SELECT * FROM users; DROP TABLE users;")
         
         assert result.allowed is False
         assert any("Multiple statements" in v for v in result.violations)
@@ -101,48 +65,37 @@ class TestSQLPolicyChecker:
 class TestPIIDetector:
     """Unit tests for PII detector."""
     
-    def test_detect_ssn(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("My SSN is 123-45-6789", "test")
+    @pytest.mark.parametrize(
+        "text, pii_type, value, min_confidence",
+        [
+            pytest.param("My SSN is 123-45-6789", "ssn", "123-45-6789", 0.9, id="ssn"),
+            pytest.param("Contact me at alice@example.com", "email", "alice@example.com", 0.0, id="email"),
+            pytest.param("Card: 4532015112830366", "credit_card", "4532015112830366", 0.0, id="credit_card_valid"),
+        ],
+    )
+    def test_detect_pii_type(self, pii_detector, text, pii_type, value, min_confidence):
+        matches = pii_detector.detect_pii(text, "test")
         
         assert len(matches) == 1
-        assert matches[0].pii_type == "ssn"
-        assert matches[0].value == "123-45-6789"
-        assert matches[0].confidence > 0.9
+        assert matches[0].pii_type == pii_type
+        assert matches[0].value == value
+        assert matches[0].confidence > min_confidence
     
-    def test_detect_email(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("Contact me at alice@example.com", "test")
-        
-        assert len(matches) == 1
-        assert matches[0].pii_type == "email"
-        assert matches[0].value == "alice@example.com"
-    
-    def test_detect_phone(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("Call me at (555) 123-4567", "test")
+    def test_detect_phone(self, pii_detector):
+        matches = pii_detector.detect_pii("Call me at (555) 123-4567", "test")
         
         assert len(matches) == 1
         assert matches[0].pii_type == "phone"
         assert "555" in matches[0].value
     
-    def test_detect_credit_card_valid(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("Card: 4532015112830366", "test")
-        
-        assert len(matches) == 1
-        assert matches[0].pii_type == "credit_card"
-    
-    def test_detect_credit_card_invalid_luhn(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("Card: 1234-5678-9012-3456", "test")
+    def test_detect_credit_card_invalid_luhn(self, pii_detector):
+        matches = pii_detector.detect_pii("Card: 1234-5678-9012-3456", "test")
         
         assert len(matches) == 0
     
-    def test_detect_multiple_pii(self):
-        detector = PIIDetector()
+    def test_detect_multiple_pii(self, pii_detector):
         text = "Contact alice@example.com or call (555) 123-4567. SSN: 123-45-6789"
-        matches = detector.detect_pii(text, "test")
+        matches = pii_detector.detect_pii(text, "test")
         
         assert len(matches) >= 3
         types = {m.pii_type for m in matches}
@@ -150,9 +103,8 @@ class TestPIIDetector:
         assert "phone" in types
         assert "ssn" in types
     
-    def test_no_pii_in_clean_text(self):
-        detector = PIIDetector()
-        matches = detector.detect_pii("The quick brown fox jumps over the lazy dog", "test")
+    def test_no_pii_in_clean_text(self, pii_detector):
+        matches = pii_detector.detect_pii("The quick brown fox jumps over the lazy dog", "test")
         
         assert len(matches) == 0
 
@@ -160,9 +112,8 @@ class TestPIIDetector:
 class TestColumnAccessControl:
     """Unit tests for column access control."""
     
-    def test_allow_all_by_default(self):
-        control = ColumnAccessControl()
-        result = control.check_column_access("users", "name")
+    def test_allow_all_by_default(self, column_access):
+        result = column_access.check_column_access("users", "name")
         
         assert result.allowed is True
         assert len(result.violations) == 0
@@ -204,57 +155,81 @@ class TestColumnAccessControl:
         assert result.allowed is False
         assert result.severity == "high"
     
-    def test_wildcard_patterns(self):
-        control = ColumnAccessControl(blocked_patterns=["*.ssn", "*.credit_card"])
-        
-        assert control.check_column_access("users", "ssn").allowed is False
-        assert control.check_column_access("customers", "credit_card").allowed is False
-        assert control.check_column_access("users", "name").allowed is True
+    @pytest.fixture(scope="module")
+    def wildcard_control(self):
+        return ColumnAccessControl(blocked_patterns=["*.ssn", "*.credit_card"])
+    
+    @pytest.mark.parametrize(
+        "table,column,allowed",
+        [
+            ("users", "ssn", False),
+            ("customers", "credit_card", False),
+            ("users", "name", True),
+        ],
+    )
+    def test_wildcard_patterns(self, wildcard_control, table, column, allowed):
+        assert wildcard_control.check_column_access(table, column).allowed is allowed
+    
+    def test_violation_names_first_matching_pattern(self):
+        control = ColumnAccessControl(blocked_patterns=["*.ssn", "users.*", "*.s*n"])
+        result = control.check_column_access("users", "ssn")
+        
+        assert result.violations == ["Column access denied: users.ssn (blocked by pattern: *.ssn)"]
+        assert "users.*" in control.check_column_access("users", "name").violations[0]
 
 
 class TestPolicyEnforcer:
     """Unit tests for policy enforcer."""
     
-    def test_validate_safe_query(self):
-        enforcer = PolicyEnforcer()
-        result = enforcer.validate_query("SELECT * FROM users WHERE age > 18")
-        
-        assert result.allowed is True
-    
-    def test_validate_dangerous_query(self):
-        enforcer = PolicyEnforcer()
-        result = enforcer.validate_query("DROP TABLE users")
-        
-        assert result.allowed is False
-        assert result.severity == "critical"
-    
-    def test_scan_data_for_pii(self):
-        enforcer = PolicyEnforcer()
+    @pytest.mark.parametrize(
+        "query,allowed,severity",
+        [
+            pytest.param("SELECT * FROM users WHERE age > 18", True, "none", id="safe"),
+            pytest.param("DROP TABLE users", False, "critical", id="dangerous"),
+        ],
+    )
+    def test_validate_query(self, policy_enforcer, query, allowed, severity):
+        result = policy_enforcer.validate_query(query)
+        
+        assert result.allowed is allowed
+        assert result.severity == severity
+    
+    def test_validate_queries_preserves_order(self, policy_enforcer):
+        results = policy_enforcer.validate_queries([
+            "SELECT id FROM users",
+            "DROP TABLE users; DELETE FROM orders",
+        ])
+        
+        assert [r.allowed for r in results] == [True, False]
+        assert "DDL operation blocked: DROP" in results[1].violations
+        assert "DML operation blocked: DELETE" in results[1].violations
+    
+    def test_scan_data_for_pii(self, policy_enforcer):
         data = [
             {"name": "Alice", "email": "alice@example.com"},
             {"name": "Bob", "email": "bob@example.com"},
         ]
-        matches = enforcer.scan_data_for_pii(data, "users")
+        matches = policy_enforcer.scan_data_for_pii(data, "users")
         
         assert len(matches) == 2
         assert all(m.pii_type == "email" for m in matches)
     
-    def test_validate_column_access_allowed(self):
-        enforcer = PolicyEnforcer()
-        result = enforcer.validate_column_access("users", ["id", "name", "email"])
-        
-        assert result.allowed is True
-    
-    def test_validate_column_access_blocked(self):
-        enforcer = PolicyEnforcer()
-        result = enforcer.validate_column_access("users", ["name", "password"])
-        
-        assert result.allowed is False
-        assert any("password" in v for v in result.violations)
-    
-    def test_validate_multiple_violations(self):
-        enforcer = PolicyEnforcer()
-        result = enforcer.validate_column_access(
+    @pytest.mark.parametrize(
+        "columns,blocked",
+        [
+            pytest.param(["id", "name", "email"], [], id="allowed"),
+            pytest.param(["name", "password"], ["password"], id="blocked"),
+        ],
+    )
+    def test_validate_column_access(self, policy_enforcer, columns, blocked):
+        result = policy_enforcer.validate_column_access("users", columns)
+        
+        assert result.allowed is (not blocked)
+        assert len(result.violations) == len(blocked)
+        assert all(any(column in v for v in result.violations) for column in blocked)
+    
+    def test_validate_multiple_violations(self, policy_enforcer):
+        result = policy_enforcer.validate_column_access(
             "users",
             ["password", "ssn", "credit_card"],
         )
@@ -267,6 +242,10 @@ class TestPolicyEnforcer:
 class TestSandboxExecutor:
     """Unit tests for sandbox executor."""
     
+    @pytest.fixture(scope="module")
+    def sandbox(self):
+        return SandboxExecutor(ResourceQuota())
+    
     def test_execute_simple_function(self):
         quota = ResourceQuota(max_execution_seconds=5.0)
         sandbox = SandboxExecutor(quota)
@@ -282,28 +261,60 @@ class TestSandboxExecutor:
         assert result.execution_time_seconds < 5.0
     
     def test_execute_with_timeout(self):
-        import sys
-        if sys.platform != "linux":
-            pytest.skip("SIGALRM not available on non-Linux platforms")
-        
-        quota = ResourceQuota(max_execution_seconds=0.1)
+        quota = ResourceQuota(max_execution_seconds=0.01)
         sandbox = SandboxExecutor(quota)
+        release = threading.Event()
         
         def slow_func():
-            import time
-            time.sleep(1.0)
+            release.wait(5.0)
             return "done"
         
-        result = sandbox.execute_in_sandbox(slow_func)
+        try:
+            result = sandbox.execute_in_sandbox(slow_func)
+        finally:
+            # Let an abandoned worker finish if the thread fallback was used
+            release.set()
         
         assert result.success is False
         assert "timeout" in result.error.lower()
         assert len(result.violations) > 0
     
-    def test_execute_with_exception(self):
-        quota = ResourceQuota()
-        sandbox = SandboxExecutor(quota)
+    def test_execute_runs_on_calling_main_thread(self, sandbox):
+        conn = sqlite3.connect(":memory:")
+        
+        def query():
+            return threading.current_thread(), conn.execute("SELECT 1").fetchone()
         
+        try:
+            result = sandbox.execute_in_sandbox(query)
+        finally:
+            conn.close()
+        
+        assert result.success is True
+        assert result.result == (threading.main_thread(), (1,))
+    
+    def test_execute_with_timeout_off_main_thread(self):
+        sandbox = SandboxExecutor(ResourceQuota(max_execution_seconds=0.01))
+        release = threading.Event()
+        results = []
+        
+        def slow_func():
+            release.wait(5.0)
+            return "done"
+        
+        caller = threading.Thread(
+            target=lambda: results.append(sandbox.execute_in_sandbox(slow_func))
+        )
+        try:
+            caller.start()
+            caller.join(5.0)
+        finally:
+            release.set()
+        
+        assert results[0].success is False
+        assert "timeout" in results[0].error.lower()
+    
+    def test_execute_with_exception(self, sandbox):
         def error_func():
             raise ValueError("Test error")
         
@@ -312,10 +323,7 @@ class TestSandboxExecutor:
         assert result.success is False
         assert "Test error" in result.error
     
-    def test_monitor_resources(self):
-        quota = ResourceQuota()
-        sandbox = SandboxExecutor(quota)
-        
+    def test_monitor_resources(self, sandbox):
         metrics = sandbox.monitor_resources()
         
         assert "memory_mb" in metrics
@@ -323,6 +331,16 @@ class TestSandboxExecutor:
         assert metrics["memory_mb"] >= 0
         assert metrics["cpu_percent"] >= 0
     
+    def test_monitor_resources_measures_cpu_since_previous_call(self):
+        sandbox = SandboxExecutor(ResourceQuota())
+        sandbox.monitor_resources()
+        
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        
+        assert sandbox.monitor_resources()["cpu_percent"] > 0
+    
     def test_memory_tracking(self):
         quota = ResourceQuota(max_memory_mb=100)
         sandbox = SandboxExecutor(quota)
@@ -336,10 +354,7 @@ class TestSandboxExecutor:
         assert result.success is True
         assert result.peak_memory_mb >= 0
     
-    def test_cpu_tracking(self):
-        quota = ResourceQuota()
-        sandbox = SandboxExecutor(quota)
-        
+    def test_cpu_tracking(self, sandbox):
         def cpu_func():
             total = 0
             for i in range(10000):
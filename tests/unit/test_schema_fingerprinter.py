@@ -7,16 +7,22 @@ schema diff, and SQL cursor support.
 import pandas as pd
 import pytest
 
-from lib.agents.data_agent.memory.schema_fingerprint import SchemaFingerprinter, TYPE_NORMALIZATION
+from lib.agents.data_agent.memory.schema_fingerprint import (
+    SchemaFingerprinter,
+    TYPE_NORMALIZATION,
+    _fingerprint_schema,
+    compute_schema_fingerprint,
+)
+
+
+pytestmark = pytest.mark.parallel
 
 
 class TestSchemaFingerprinterClass:
     """Test SchemaFingerprinter class methods."""
     
-    def test_type_normalization_enabled(self):
+    def test_type_normalization_enabled(self, fingerprinter):
         """Type normalization produces consistent fingerprints across similar types."""
-        fingerprinter = SchemaFingerprinter(normalize_types=True)
-        
         schema_int64 = {"value": "int64"}
         schema_int32 = {"value": "int32"}
         
@@ -37,17 +43,13 @@ class TestSchemaFingerprinterClass:
         
         assert fp1 != fp2, "Without normalization, int64 and int32 should differ"
     
-    def test_empty_schema_raises_error(self):
+    def test_empty_schema_raises_error(self, fingerprinter):
         """Empty schema should raise ValueError."""
-        fingerprinter = SchemaFingerprinter()
-        
         with pytest.raises(ValueError, match="Cannot compute fingerprint for empty schema"):
             fingerprinter.compute_fingerprint({})
     
-    def test_compute_fingerprint_from_dataframe(self):
+    def test_compute_fingerprint_from_dataframe(self, fingerprinter):
         """Fingerprint can be computed directly from DataFrame."""
-        fingerprinter = SchemaFingerprinter(normalize_types=True)
-        
         df = pd.DataFrame({
             "user_id": [1, 2, 3],
             "email": ["a@test.com", "b@test.com", "c@test.com"],
@@ -58,10 +60,8 @@ class TestSchemaFingerprinterClass:
         assert isinstance(fp, str)
         assert len(fp) == 64
     
-    def test_schemas_match(self):
+    def test_schemas_match(self, fingerprinter):
         """schemas_match correctly identifies matching fingerprints."""
-        fingerprinter = SchemaFingerprinter()
-        
         fp1 = "abc123"
         fp2 = "abc123"
         fp3 = "def456"
@@ -69,10 +69,8 @@ class TestSchemaFingerprinterClass:
         assert fingerprinter.schemas_match(fp1, fp2) is True
         assert fingerprinter.schemas_match(fp1, fp3) is False
     
-    def test_get_schema_diff_no_changes(self):
+    def test_get_schema_diff_no_changes(self, fingerprinter):
         """Schema diff with identical schemas shows no changes."""
-        fingerprinter = SchemaFingerprinter()
-        
         schema1 = {"id": "int64", "name": "string"}
         schema2 = {"id": "int64", "name": "string"}
         
@@ -83,10 +81,8 @@ class TestSchemaFingerprinterClass:
         assert diff["changed_types"] == {}
         assert diff["is_compatible"] is True
     
-    def test_get_schema_diff_added_columns(self):
+    def test_get_schema_diff_added_columns(self, fingerprinter):
         """Schema diff detects added columns."""
-        fingerprinter = SchemaFingerprinter()
-        
         schema1 = {"id": "int64"}
         schema2 = {"id": "int64", "name": "string"}
         
@@ -96,10 +92,8 @@ class TestSchemaFingerprinterClass:
         assert diff["removed_columns"] == []
         assert diff["is_compatible"] is True
     
-    def test_get_schema_diff_removed_columns(self):
+    def test_get_schema_diff_removed_columns(self, fingerprinter):
         """Schema diff detects removed columns."""
-        fingerprinter = SchemaFingerprinter()
-        
         schema1 = {"id": "int64", "name": "string"}
         schema2 = {"id": "int64"}
         
@@ -109,10 +103,8 @@ class TestSchemaFingerprinterClass:
         assert "name" in diff["removed_columns"]
         assert diff["is_compatible"] is False
     
-    def test_get_schema_diff_changed_types(self):
+    def test_get_schema_diff_changed_types(self, fingerprinter):
         """Schema diff detects type changes."""
-        fingerprinter = SchemaFingerprinter()
-        
         schema1 = {"value": "int64"}
         schema2 = {"value": "string"}
         
@@ -123,20 +115,27 @@ class TestSchemaFingerprinterClass:
         assert diff["changed_types"]["value"]["to"] == "string"
         assert diff["is_compatible"] is False
     
-    def test_normalize_type(self):
-        """Type normalization mapping works correctly."""
-        fingerprinter = SchemaFingerprinter(normalize_types=True)
+    def test_get_schema_diff_preserves_column_order(self, fingerprinter):
+        """Schema diff lists columns in schema order."""
+        schema1 = {"c": "int64", "b": "int64", "a": "int64", "z": "int64"}
+        schema2 = {"z": "int64", "b": "string", "y": "int64", "a": "string", "x": "int64"}
+        
+        diff = fingerprinter.get_schema_diff(schema1, schema2)
         
+        assert diff["added_columns"] == ["y", "x"]
+        assert diff["removed_columns"] == ["c"]
+        assert list(diff["changed_types"]) == ["b", "a"]
+    
+    def test_normalize_type(self, fingerprinter):
+        """Type normalization mapping works correctly."""
         assert fingerprinter._normalize_type("int64") == "integer"
         assert fingerprinter._normalize_type("float32") == "float"
         assert fingerprinter._normalize_type("object") == "string"
         assert fingerprinter._normalize_type("datetime64[ns]") == "timestamp"
         assert fingerprinter._normalize_type("bool") == "boolean"
     
-    def test_sql_type_to_string(self):
+    def test_sql_type_to_string(self, fingerprinter):
         """SQL type code conversion works correctly."""
-        fingerprinter = SchemaFingerprinter()
-        
         assert fingerprinter._sql_type_to_string(1) == "integer"
         assert fingerprinter._sql_type_to_string(4) == "float"
         assert fingerprinter._sql_type_to_string(8) == "string"
@@ -144,10 +143,8 @@ class TestSchemaFingerprinterClass:
         assert fingerprinter._sql_type_to_string(None) == "unknown"
         assert fingerprinter._sql_type_to_string(999) == "type_999"
     
-    def test_compute_fingerprint_from_sql_result(self):
+    def test_compute_fingerprint_from_sql_result(self, fingerprinter):
         """Fingerprint can be computed from SQL cursor description."""
-        fingerprinter = SchemaFingerprinter()
-        
         cursor_description = [
             ("user_id", 1, None, None, None, None, None),
             ("email", 8, None, None, None, None, None),
@@ -166,10 +163,8 @@ class TestSchemaFingerprinterClass:
         assert TYPE_NORMALIZATION["float32"] == "float"
         assert TYPE_NORMALIZATION["object"] == "string"
     
-    def test_fingerprint_deterministic_with_normalization(self):
+    def test_fingerprint_deterministic_with_normalization(self, fingerprinter):
         """Fingerprints are deterministic with type normalization."""
-        fingerprinter = SchemaFingerprinter(normalize_types=True)
-        
         df1 = pd.DataFrame({"value": [1, 2, 3]})
         df2 = pd.DataFrame({"value": pd.array([1, 2, 3], dtype="int32")})
         
@@ -178,14 +173,32 @@ class TestSchemaFingerprinterClass:
         
         assert fp1 == fp2, "Different int types should normalize to same fingerprint"
     
-    def test_table_name_not_in_fingerprint(self):
+    def test_table_name_not_in_fingerprint(self, fingerprinter):
         """Table name parameter doesn't affect fingerprint value."""
-        fingerprinter = SchemaFingerprinter()
-        
         schema = {"id": "int64", "name": "string"}
         
         fp1 = fingerprinter.compute_fingerprint(schema, table_name="users")
         fp2 = fingerprinter.compute_fingerprint(schema, table_name="customers")
         fp3 = fingerprinter.compute_fingerprint(schema)
         
-        assert fp1 == fp2 == fp3, "Table name should not affect fingerprint"
\ No newline at end of file
+        assert fp1 == fp2 == fp3, "Table name should not affect fingerprint"
+
+class TestComputeSchemaFingerprint:
+    """Test the module-level DataFrame fingerprint helper."""
+    
+    def test_matches_fingerprinter_and_is_memoized(self):
+        """Helper agrees with SchemaFingerprinter and reuses cached results."""
+        df = pd.DataFrame({"sales": [100, 200], "region": ["AZ", "CA"]})
+        expected = SchemaFingerprinter().compute_fingerprint_from_dataframe(df)
+        
+        _fingerprint_schema.cache_clear()
+        fp1 = compute_schema_fingerprint(df)
+        fp2 = compute_schema_fingerprint(pd.DataFrame({"sales": [1], "region": ["TX"]}))
+        
+        assert fp1 == fp2 == expected
+        assert _fingerprint_schema.cache_info().hits == 1
+    
+    def test_empty_dataframe_raises_error(self):
+        """Empty schema should still raise ValueError through the cache."""
+        with pytest.raises(ValueError, match="Cannot compute fingerprint for empty schema"):
+            compute_schema_fingerprint(pd.DataFrame())
@@ -12,6 +12,12 @@ from lib.evaluation.gepa_specification_metric import GEPASpecificationMetric
 from lib.evaluation.gepa_generalization_handler import GEPAGeneralizationHandler
 from lib.data.dex_adapter import dex_adapter
 
+rng = np.random.default_rng()
+
+def strategy_to_json(strategy):
+    """Serialize a strategy dict as compact JSON, without whitespace"""
+    return json.dumps(strategy, separators=(',', ':'))
+
 def test_10_percent_volatility():
     """
     Test system with 10% daily volatility
@@ -25,15 +31,20 @@ def test_10_percent_volatility():
     # Initialize components
     handler = GEPAGeneralizationHandler()
     
+    # (low, high) bounds for sharpe, win rate, drawdown size and profit factor
+    backtest_low = [0.8, 0.45, 0.25, 1.1]
+    backtest_high = [1.5, 0.55, 0.40, 1.5]
+    
     # Mock backtest for testing
     def mock_backtest(strategy, df):
         """Simulate backtest results for 10% volatility"""
         # At 10% volatility, performance is typically lower
+        sharpe, win_rate, drawdown, profit_factor = rng.uniform(backtest_low, backtest_high)
         return {
-            'sharpe_ratio': np.random.uniform(0.8, 1.5),
-            'win_rate': np.random.uniform(0.45, 0.55),
-            'max_drawdown': -np.random.uniform(0.25, 0.40),
-            'profit_factor': np.random.uniform(1.1, 1.5),
+            'sharpe_ratio': sharpe,
+            'win_rate': win_rate,
+            'max_drawdown': -drawdown,
+            'profit_factor': profit_factor,
             'total_trades': 100
         }
     
@@ -86,7 +97,7 @@ def test_10_percent_volatility():
     # Create mock prediction
     class MockPrediction:
         def __init__(self, s):
-            self.strategy = json.dumps(s) if isinstance(s, dict) else s
+            self.strategy = strategy_to_json(s) if isinstance(s, dict) else s
             self.reasoning = "Strategy optimized for 10% daily volatility"
     
     pred = MockPrediction(strategy)
@@ -126,12 +137,15 @@ def test_10_percent_volatility():
         elif result.score < 0.5:
             failure_count += 1
     
+    scores = np.asarray(scores)
+    mean_score = scores.mean()
+    
     print(f"\nFailure Summary:")
     print(f"  Zero Scores (0.0): {zero_scores}/10")
     print(f"  Partial Scores (<0.1): {partial_scores}/10")
     print(f"  Failed Scores (<0.5): {failure_count}/10")
-    print(f"  Average Score: {np.mean(scores):.3f}")
-    print(f"  Score Range: {min(scores):.3f} - {max(scores):.3f}")
+    print(f"  Average Score: {mean_score:.3f}")
+    print(f"  Score Range: {scores.min():.3f} - {scores.max():.3f}")
     
     # Test 4: Ensemble generation (multiple attempts)
     print(f"\n{'='*60}")
@@ -184,7 +198,7 @@ def test_10_percent_volatility():
     print("RECOMMENDATIONS")
     print(f"{'='*80}")
     
-    if zero_scores > 0 or np.mean(scores) < 0.6:
+    if zero_scores > 0 or mean_score < 0.6:
         print("\n⚠️ System needs improvement for 10% volatility:")
         print("1. Add retry logic for failed generations")
         print("2. Use fallback strategies more aggressively")
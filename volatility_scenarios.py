@@ -16,36 +16,83 @@ import dspy
 from dspy import Example
 from dspy.teleprompt.gepa.gepa_utils import ScoreWithFeedback
 
+# Shared PCG64 generator for synthetic prices and mock backtest draws
+rng = np.random.default_rng()
+
+def strategy_to_json(strategy):
+    """Serialize a strategy dict as compact JSON, without whitespace"""
+    return json.dumps(strategy, separators=(',', ':'))
+
+# Strategy responses evaluated in every scenario; treat as read-only
+TEST_STRATEGIES = (
+    {
+        "type": "momentum",
+        "entry_conditions": {"rsi": 30, "volume_surge": 1.5},
+        "exit_conditions": {"rsi": 70},
+        "stop_loss_percentage": 2,
+        "take_profit_percentage": 5
+    },
+    {
+        "type": "mean_reversion",
+        "entry_conditions": {"zscore": 2.0},
+        "exit_conditions": {"zscore": 0.5},
+        "stop_loss_percentage": 3,
+        "take_profit_percentage": 3
+    },
+)
+
+class MockPred:
+    """Mock prediction wrapping a strategy for a volatility scenario"""
+    def __init__(self, s, vol_pct):
+        self.strategy = strategy_to_json(s)
+        self.reasoning = f"Strategy for {vol_pct}% volatility environment"
+
 # Create synthetic data with different volatility levels
 def create_test_data(volatility_pct=10.0, periods=1000):
-    """Create synthetic OHLCV data with specified daily volatility"""
+    """Create synthetic OHLCV data with specified daily volatility
+
+    The realized close-to-close volatility (%) is stored in
+    df.attrs['realized_volatility_pct'] so callers need not recompute it.
+    """
     
     # Daily volatility as decimal
     daily_vol = volatility_pct / 100
     
     # Generate returns with specified volatility
-    returns = np.random.normal(0, daily_vol, periods)
+    returns = rng.standard_normal(periods)
+    returns *= daily_vol
     
     # Create price series
     initial_price = 100
-    prices = initial_price * np.exp(np.cumsum(returns))
+    prices = np.cumsum(returns, out=returns)
+    np.exp(prices, out=prices)
+    prices *= initial_price
+    
+    # Draw all OHLV noise in one call, one contiguous row per column, then
+    # scale each in place: open +/-0.5%, high +0-1%, low -0-1%, volume 1000-10000
+    ohlv = rng.random((4, periods))
+    ohlv[0] -= 0.5
+    ohlv[:3] *= 0.01
+    ohlv[2] *= -1
+    ohlv[:3] += 1
+    ohlv[:3] *= prices
+    ohlv[3] *= 9000
+    ohlv[3] += 1000
     
     # Create OHLCV
-    dates = pd.date_range(end=pd.Timestamp.now(), periods=periods, freq='5min')
+    dates = pd.date_range(end=pd.Timestamp.now(), periods=periods, freq='5min', name='timestamp')
     
     df = pd.DataFrame({
-        'timestamp': dates,
-        'open': prices * (1 + np.random.uniform(-0.005, 0.005, periods)),
-        'high': prices * (1 + np.random.uniform(0, 0.01, periods)),
-        'low': prices * (1 - np.random.uniform(0, 0.01, periods)),
+        'open': ohlv[0],
+        'high': ohlv[1],
+        'low': ohlv[2],
         'close': prices,
-        'volume': np.random.uniform(1000, 10000, periods)
-    })
+        'volume': ohlv[3]
+    }, index=dates)
     
-    df = df.set_index('timestamp')
-    
-    # Verify volatility
-    actual_vol = df['close'].pct_change().std() * 100
+    # Verify volatility, straight from the price array rather than through pct_change
+    actual_vol = (prices[1:] / prices[:-1] - 1).std(ddof=1) * 100
+    df.attrs['realized_volatility_pct'] = actual_vol
     print(f"Created data with target {volatility_pct}% volatility, actual: {actual_vol:.2f}%")
     
     return df
@@ -61,29 +108,28 @@ def test_volatility_scenarios():
         (20.0, "crisis"),  # Extreme crisis
     ]
     
+    # (low, high) bounds for sharpe, win rate and drawdown size
+    extreme_bounds = ([0.3, 0.35, 0.3], [0.8, 0.45, 0.5])
+    high_bounds = ([0.8, 0.4, 0.2], [1.5, 0.5, 0.35])
+    normal_bounds = ([1.5, 0.5, 0.1], [2.5, 0.6, 0.25])
+    
     # Simple backtest function for testing
-    def mock_backtest(strategy, df):
-        """Mock backtest that adjusts results based on volatility"""
-        vol = df['close'].pct_change().std() * 100
-        
+    def mock_backtest(strategy, vol):
+        """Mock backtest that adjusts results based on realized volatility (%)"""
         # Simulate worse performance in extreme volatility
         if vol > 10:
-            sharpe = np.random.uniform(0.3, 0.8)
-            win_rate = np.random.uniform(0.35, 0.45)
-            max_dd = -np.random.uniform(0.3, 0.5)
+            low, high = extreme_bounds
         elif vol > 5:
-            sharpe = np.random.uniform(0.8, 1.5)
-            win_rate = np.random.uniform(0.4, 0.5)
-            max_dd = -np.random.uniform(0.2, 0.35)
+            low, high = high_bounds
         else:
-            sharpe = np.random.uniform(1.5, 2.5)
-            win_rate = np.random.uniform(0.5, 0.6)
-            max_dd = -np.random.uniform(0.1, 0.25)
+            low, high = normal_bounds
+        
+        sharpe, win_rate, drawdown = rng.uniform(low, high)
         
         return {
             'sharpe_ratio': sharpe,
             'win_rate': win_rate,
-            'max_drawdown': max_dd,
+            'max_drawdown': -drawdown,
             'profit_factor': 1 + (sharpe * 0.2),
             'total_trades': 100
         }
@@ -97,36 +143,14 @@ def test_volatility_scenarios():
         
         # Create test data
         df = create_test_data(vol_pct)
+        realized_vol = df.attrs['realized_volatility_pct']
         
         # Create metric with this data
-        metric = create_enhanced_metric(lambda s: mock_backtest(s, df))
+        metric = create_enhanced_metric(lambda s: mock_backtest(s, realized_vol))
         
         # Test different strategy responses
-        test_strategies = [
-            {
-                "type": "momentum",
-                "entry_conditions": {"rsi": 30, "volume_surge": 1.5},
-                "exit_conditions": {"rsi": 70},
-                "stop_loss_percentage": 2,
-                "take_profit_percentage": 5
-            },
-            {
-                "type": "mean_reversion",
-                "entry_conditions": {"zscore": 2.0},
-                "exit_conditions": {"zscore": 0.5},
-                "stop_loss_percentage": 3,
-                "take_profit_percentage": 3
-            }
-        ]
-        
-        for strategy in test_strategies:
-            # Create mock prediction
-            class MockPred:
-                def __init__(self, s):
-                    self.strategy = json.dumps(s)
-                    self.reasoning = f"Strategy for {vol_pct}% volatility environment"
-            
-            pred = MockPred(strategy)
+        for strategy in TEST_STRATEGIES:
+            pred = MockPred(strategy, vol_pct)
             
             # Evaluate
             result = metric(None, pred)